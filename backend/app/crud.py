@@ -1,3 +1,4 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app import models, schemas
 from typing import List, Optional
@@ -19,6 +20,24 @@ def create_recipe(db: Session, recipe: schemas.RecipeCreate):
     return db_recipe
 
 
+def create_recipes_bulk(db: Session, recipes: List[schemas.RecipeCreate]):
+    """Insert many recipes with a single INSERT statement and one commit
+
+    Rows come back as plain dicts from RETURNING, so reading them after the
+    commit does not trigger a refresh SELECT per recipe.
+    """
+    if not recipes:
+        return []
+    table = models.Recipe.__table__
+    rows = db.execute(
+        insert(table).returning(*table.c, sort_by_parameter_order=True),
+        [recipe.model_dump() for recipe in recipes],
+    )
+    db_recipes = [dict(row) for row in rows.mappings()]
+    db.commit()
+    return db_recipes
+
+
 def delete_recipe(db: Session, recipe_id: int):
     db_recipe = db.query(models.Recipe).filter(models.Recipe.id == recipe_id).first()
     if db_recipe:
@@ -28,6 +47,14 @@ def delete_recipe(db: Session, recipe_id: int):
     return False
 
 
+def get_existing_recipe_ids(db: Session, recipe_ids: List[int]):
+    """Return the subset of recipe_ids that exist, using a single query"""
+    if not recipe_ids:
+        return set()
+    rows = db.query(models.Recipe.id).filter(models.Recipe.id.in_(recipe_ids)).all()
+    return {row.id for row in rows}
+
+
 def update_recipe_rating(db: Session, recipe_id: int, rating: float):
     db_recipe = db.query(models.Recipe).filter(models.Recipe.id == recipe_id).first()
     if db_recipe:
@@ -47,7 +74,24 @@ def create_meal_plan(db: Session, meal_plan: schemas.MealPlanCreate):
 
 
 def get_meal_plans(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.MealPlan).offset(skip).limit(limit).all()
+    return (
+        db.query(models.MealPlan)
+        .order_by(models.MealPlan.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_meal_plans_after(db: Session, cursor: int = 0, limit: int = 100):
+    """Get meal plans with an ID greater than the cursor (keyset pagination)"""
+    return (
+        db.query(models.MealPlan)
+        .filter(models.MealPlan.id > cursor)
+        .order_by(models.MealPlan.id)
+        .limit(limit)
+        .all()
+    )
 
 
 def get_meal_plan(db: Session, meal_plan_id: int):
@@ -1,6 +1,7 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from pydantic import ValidationError
 from app.routers import recipes, meal_plans
 from app.database import engine, Base
@@ -20,6 +21,7 @@ app = FastAPI(
     title="AI Recipe Generator",
     description="Generate recipes using AI based on ingredients with comprehensive validation",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Add custom exception handlers
@@ -1,8 +1,30 @@
 from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Float
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import func
+from sqlalchemy.sql.functions import GenericFunction
 from app.database import Base
 
 
+class recipe_ingredient_names(GenericFunction):
+    """Lowercased ingredient ``name`` values of a recipe, one per line.
+
+    Lets search match ingredient names only, never the keys or escaped
+    text of the serialized JSON. On PostgreSQL this calls the SQL function
+    defined in database/init.sql, which the trigram index is built on.
+    """
+
+    type = Text()
+    inherit_cache = True
+
+
+@compiles(recipe_ingredient_names, "sqlite")
+def _compile_recipe_ingredient_names_sqlite(element, compiler, **kw):
+    return (
+        "(SELECT lower(group_concat(json_extract(value, '$.name'), char(10))) "
+        f"FROM json_each({compiler.process(element.clauses, **kw)}))"
+    )
+
+
 class Recipe(Base):
     __tablename__ = "recipes"
 
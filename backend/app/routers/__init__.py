@@ -1 +1,11 @@
-# Empty file to make this a Python package
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def validated_response(model: BaseModel) -> ORJSONResponse:
+    """Serialize a response model the route has already validated
+
+    Returning a response directly skips FastAPI's second validation pass
+    against the route's response_model.
+    """
+    return ORJSONResponse(content=model.model_dump(mode="json"))
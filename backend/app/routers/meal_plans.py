@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app import crud, schemas
 from app.database import get_db
+from app.routers import validated_response
 import logging
 
 router = APIRouter()
@@ -18,18 +19,23 @@ async def create_meal_plan(
         logger.info(f"📅 Creating meal plan: {meal_plan.name}")
         
         # Validate that all recipe IDs exist
-        all_recipe_ids = []
+        all_recipe_ids = set()
         for day_recipes in meal_plan.recipes.values():
-            all_recipe_ids.extend(day_recipes)
+            all_recipe_ids.update(day_recipes)
         
-        # Check if all recipes exist
-        for recipe_id in all_recipe_ids:
-            recipe = crud.get_recipe(db, recipe_id=recipe_id)
-            if not recipe:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Recipe with ID {recipe_id} not found"
-                )
+        # Check all recipes with one query instead of one lookup per ID
+        existing_ids = crud.get_existing_recipe_ids(db, list(all_recipe_ids))
+        missing_ids = sorted(all_recipe_ids - existing_ids)
+        if len(missing_ids) == 1:
+            raise HTTPException(
+                status_code=422, 
+                detail=f"Recipe with ID {missing_ids[0]} not found"
+            )
+        if missing_ids:
+            raise HTTPException(
+                status_code=422, 
+                detail=f"Recipes with IDs {', '.join(map(str, missing_ids))} not found"
+            )
         
         db_meal_plan = crud.create_meal_plan(db=db, meal_plan=meal_plan)
         logger.info(f"✅ Created meal plan with ID: {db_meal_plan.id}")
@@ -46,10 +52,30 @@ async def create_meal_plan(
 async def get_meal_plans(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[int] = Query(
+        None, ge=0, description="Return meal plans after this ID (overrides page)"
+    ),
     db: Session = Depends(get_db)
 ):
     """Get paginated list of meal plans"""
     try:
+        if cursor is not None:
+            logger.info(f"📋 Fetching meal plans - after {cursor}, size {page_size}")
+
+            # Fetch one extra row to know whether another page exists
+            meal_plans = crud.get_meal_plans_after(
+                db, cursor=cursor, limit=page_size + 1
+            )
+            total = crud.get_meal_plans_count(db)
+
+            page_response = schemas.PaginatedMealPlansResponse.from_cursor(
+                items=meal_plans,
+                total=total,
+                cursor=cursor,
+                per_page=page_size
+            )
+            return validated_response(page_response)
+
         logger.info(f"📋 Fetching meal plans - page {page}, size {page_size}")
         
         skip = (page - 1) * page_size
@@ -58,12 +84,13 @@ async def get_meal_plans(
         
         logger.info(f"✅ Retrieved {len(meal_plans)} meal plans (total: {total})")
         
-        return schemas.PaginatedMealPlansResponse.paginate(
+        page_response = schemas.PaginatedMealPlansResponse.paginate(
             items=meal_plans,
             total=total,
             page=page,
             per_page=page_size
         )
+        return validated_response(page_response)
         
     except Exception as e:
         logger.error(f"❌ Error fetching meal plans: {str(e)}")
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Body, Depends, HTTPException, BackgroundTasks, Query
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Annotated, List, Optional
 import logging
 
+from app import crud
 from app.database import get_db
-from app.models import Recipe
+from app.models import Recipe, recipe_ingredient_names
+from app.routers import validated_response
 from app.schemas import RecipeCreate, Recipe as RecipeSchema, RecipeGenerateResponse, PaginatedResponse
 from app.services.gemini_service import GeminiService
 
@@ -12,13 +15,18 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Upper bound on recipes accepted by a single bulk create request
+MAX_BULK_RECIPES = 100
+
 @router.get("/recipes", response_model=PaginatedResponse)
 async def get_recipes(
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[int] = None,
+    include_total: bool = True,
     db: Session = Depends(get_db)
 ):
-    """Get recipes with pagination"""
+    """Get recipes with pagination (page-based, or keyset when cursor is given)"""
     try:
         # Validate pagination parameters
         if page < 1:
@@ -26,14 +34,39 @@ async def get_recipes(
         if page_size < 1 or page_size > 100:
             page_size = 10
             
+        # Get total count, unless the caller opted out of the COUNT(*) query
+        total = db.query(Recipe).count() if include_total else None
+        
+        if cursor is not None:
+            cursor = max(cursor, 0)
+            # Seek past the last seen ID; fetch one extra row to detect a next page
+            recipes = (
+                db.query(Recipe)
+                .filter(Recipe.id > cursor)
+                .order_by(Recipe.id)
+                .limit(page_size + 1)
+                .all()
+            )
+            return PaginatedResponse.from_cursor(recipes, total, cursor, page_size)
+        
         # Calculate offset
         offset = (page - 1) * page_size
         
-        # Get total count
-        total = db.query(Recipe).count()
+        if total is None:
+            # Without a total, fetch one extra row to detect a next page
+            recipes = (
+                db.query(Recipe)
+                .order_by(Recipe.id)
+                .offset(offset)
+                .limit(page_size + 1)
+                .all()
+            )
+            return PaginatedResponse.paginate_lookahead(recipes, page, page_size)
         
         # Get paginated recipes
-        recipes = db.query(Recipe).offset(offset).limit(page_size).all()
+        recipes = (
+            db.query(Recipe).order_by(Recipe.id).offset(offset).limit(page_size).all()
+        )
         
         # Return paginated response
         return PaginatedResponse.paginate(recipes, total, page, page_size)
@@ -42,6 +75,101 @@ async def get_recipes(
         logger.error(f"Error getting recipes: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch recipes")
 
+@router.get("/recipes/search", response_model=PaginatedResponse)
+async def search_recipes(
+    q: Optional[str] = Query(
+        None,
+        min_length=1,
+        max_length=200,
+        description=(
+            "Search text; separate several terms with commas. A term matches "
+            "when all of its words appear"
+        ),
+    ),
+    difficulty: Optional[str] = Query(None, pattern="^(Easy|Medium|Hard|Expert)$"),
+    min_rating: Optional[float] = Query(None, ge=1.0, le=5.0),
+    max_prep_time: Optional[int] = Query(None, ge=0, le=600),
+    max_cook_time: Optional[int] = Query(None, ge=0, le=1440),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    cursor: Optional[int] = Query(
+        None, ge=0, description="Return matches after this recipe ID (keyset)"
+    ),
+    db: Session = Depends(get_db)
+):
+    """Search recipe titles, descriptions and ingredient names (case-insensitive),
+    optionally narrowed by difficulty, rating and time filters
+
+    Pages by page/page_size, or by keyset when cursor is given so deep pages
+    cost the same as the first.
+    """
+    terms = []
+    if q is not None:
+        # Each comma-separated term becomes its list of lowercased words
+        terms = [term.lower().split() for term in q.split(",") if term.strip()]
+        if not terms:
+            raise HTTPException(status_code=422, detail="Search query cannot be empty")
+
+    try:
+        query = db.query(Recipe)
+
+        if terms:
+            # Every term goes into one OR'ed WHERE clause, so several terms
+            # still cost a single scan; the words of a term are AND'ed in SQL
+            searchable = (
+                func.lower(Recipe.title),
+                func.lower(Recipe.description),
+                recipe_ingredient_names(Recipe.ingredients),
+            )
+
+            def word_matches(word):
+                return or_(
+                    *(column.contains(word, autoescape=True) for column in searchable)
+                )
+
+            query = query.filter(
+                or_(*(and_(*map(word_matches, words)) for words in terms))
+            )
+        if difficulty is not None:
+            query = query.filter(Recipe.difficulty == difficulty)
+        if min_rating is not None:
+            query = query.filter(Recipe.rating >= min_rating)
+        if max_prep_time is not None:
+            query = query.filter(Recipe.prep_time <= max_prep_time)
+        if max_cook_time is not None:
+            query = query.filter(Recipe.cook_time <= max_cook_time)
+
+        # Count straight off the filtered table; Query.count() would wrap
+        # the full row SELECT in a subquery first
+        total = query.with_entities(func.count(Recipe.id)).scalar()
+
+        if cursor is not None:
+            # Seek past the last seen ID; fetch one extra row to detect a next page
+            recipes = (
+                query.filter(Recipe.id > cursor)
+                .order_by(Recipe.id)
+                .limit(page_size + 1)
+                .all()
+            )
+            page_response = PaginatedResponse.from_cursor(
+                recipes, total, cursor, page_size
+            )
+            return validated_response(page_response)
+
+        recipes = (
+            query.order_by(Recipe.id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .all()
+        )
+
+        page_response = PaginatedResponse.paginate(recipes, total, page, page_size)
+        return validated_response(page_response)
+
+    except Exception as e:
+        logger.error(f"Error searching recipes: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to search recipes")
+
 @router.post("/recipes", response_model=RecipeSchema)
 async def create_recipe(recipe: RecipeCreate, db: Session = Depends(get_db)):
     """Create a new recipe"""
@@ -55,6 +183,18 @@ async def create_recipe(recipe: RecipeCreate, db: Session = Depends(get_db)):
         logger.error(f"Error creating recipe: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to create recipe")
 
+@router.post("/recipes/bulk", response_model=List[RecipeSchema])
+async def create_recipes_bulk(
+    recipes: Annotated[List[RecipeCreate], Body(max_length=MAX_BULK_RECIPES)],
+    db: Session = Depends(get_db)
+):
+    """Create several recipes in one request with a single INSERT"""
+    try:
+        return crud.create_recipes_bulk(db, recipes)
+    except Exception as e:
+        logger.error(f"Error creating recipes in bulk: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to create recipes")
+
 @router.post("/recipes/generate", response_model=RecipeGenerateResponse)
 async def generate_recipe(
     request: dict,
@@ -1,8 +1,24 @@
 from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Annotated
 from datetime import datetime
 import re
 
+# Validator patterns, compiled once at import rather than looked up per call
+INGREDIENT_NAME_RE = re.compile(r"^[\w\s\-\'\.()&,:%;]+$", re.UNICODE)
+INGREDIENT_TEXT_RE = re.compile(r"^[a-zA-Z0-9\s\-\'\.()&,%;]+$")
+UNSAFE_SEARCH_CHARS_RE = re.compile(r'[<>"\';]')
+
+DAY_ORDER = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+VALID_DAYS = frozenset(DAY_ORDER)
+
 
 class IngredientSchema(BaseModel):
     """Schema for individual ingredient validation"""
@@ -20,10 +36,10 @@ class IngredientSchema(BaseModel):
         if not v.strip():
             raise ValueError("Ingredient name cannot be empty")
         # Remove extra whitespace and validate format
-        clean_name = re.sub(r"\s+", " ", v.strip())
+        clean_name = " ".join(v.split())
         # Allow Unicode letters, numbers, spaces, and common punctuation for international ingredients
         # Updated to include percentage sign and be more permissive
-        if not re.match(r"^[\w\s\-\'\.()&,:%;]+$", clean_name, re.UNICODE):
+        if not INGREDIENT_NAME_RE.match(clean_name):
             raise ValueError("Ingredient name contains invalid characters")
         return clean_name
 
@@ -63,7 +79,7 @@ class IngredientSchema(BaseModel):
         if not v:
             return v
         # Just clean up the unit, don't restrict too much
-        clean_unit = re.sub(r"\s+", " ", v.strip())
+        clean_unit = " ".join(v.split())
         return clean_unit
 
 
@@ -115,7 +131,7 @@ class RecipeBase(BaseModel):
         if not v.strip():
             raise ValueError("Recipe title cannot be empty")
         # Clean up title
-        clean_title = re.sub(r"\s+", " ", v.strip())
+        clean_title = " ".join(v.split())
         if len(clean_title) < 3:
             raise ValueError("Recipe title must be at least 3 characters long")
         return clean_title
@@ -203,7 +219,7 @@ class RecipeGenerateRequest(BaseModel):
             if not isinstance(ingredient, str):
                 raise ValueError("All ingredients must be strings")
 
-            clean_ingredient = re.sub(r"\s+", " ", ingredient.strip())
+            clean_ingredient = " ".join(ingredient.split())
             if not clean_ingredient:
                 raise ValueError("Ingredient cannot be empty")
 
@@ -213,7 +229,7 @@ class RecipeGenerateRequest(BaseModel):
             if len(clean_ingredient) > 100:
                 raise ValueError("Ingredient name cannot exceed 100 characters")
 
-            if not re.match(r"^[a-zA-Z0-9\s\-\'\.()&,%;]+$", clean_ingredient):
+            if not INGREDIENT_TEXT_RE.match(clean_ingredient):
                 raise ValueError(
                     f"Invalid characters in ingredient: {clean_ingredient}"
                 )
@@ -341,7 +357,11 @@ class RecipeGenerateResponse(BaseModel):
 
 class MealPlanBase(BaseModel):
     name: str = Field(..., min_length=3, max_length=100, description="Meal plan name")
-    recipes: Dict[str, List[int]] = Field(..., description="Day to recipe IDs mapping")
+    # Type and per-day size checks run in pydantic-core; only the rules that
+    # need custom messages are left to validate_recipes
+    recipes: Dict[str, Annotated[List[int], Field(max_length=10)]] = Field(
+        ..., description="Day to recipe IDs mapping (maximum 10 recipes per day)"
+    )
 
     @field_validator("name")
     @classmethod
@@ -349,7 +369,7 @@ class MealPlanBase(BaseModel):
         if not v.strip():
             raise ValueError("Meal plan name cannot be empty")
 
-        clean_name = re.sub(r"\s+", " ", v.strip())
+        clean_name = " ".join(v.split())
         if len(clean_name) < 3:
             raise ValueError("Meal plan name must be at least 3 characters long")
 
@@ -361,38 +381,23 @@ class MealPlanBase(BaseModel):
         if not v:
             raise ValueError("Meal plan must contain at least one day")
 
-        valid_days = [
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "saturday",
-            "sunday",
-        ]
-
-        for day, recipe_ids in v.items():
-            # Validate day names
-            if day.lower() not in valid_days:
-                raise ValueError(
-                    f'Invalid day: {day}. Must be one of: {", ".join(valid_days)}'
-                )
+        # Common case: every key is already a lowercase day name, which one
+        # set comparison confirms without looping in Python
+        if not v.keys() <= VALID_DAYS:
+            for day in v:
+                if day.lower() not in VALID_DAYS:
+                    raise ValueError(
+                        f'Invalid day: {day}. Must be one of: {", ".join(DAY_ORDER)}'
+                    )
 
+        for recipe_ids in v.values():
             # Validate recipe IDs
-            if not isinstance(recipe_ids, list):
-                raise ValueError(f"Recipe IDs for {day} must be a list")
-
-            if len(recipe_ids) > 10:
+            if recipe_ids and min(recipe_ids) <= 0:
+                recipe_id = next(i for i in recipe_ids if i <= 0)
                 raise ValueError(
-                    f"Too many recipes for {day}. Maximum 10 recipes per day"
+                    f"Invalid recipe ID: {recipe_id}. Must be a positive integer"
                 )
 
-            for recipe_id in recipe_ids:
-                if not isinstance(recipe_id, int) or recipe_id <= 0:
-                    raise ValueError(
-                        f"Invalid recipe ID: {recipe_id}. Must be a positive integer"
-                    )
-
         return v
 
 
@@ -475,7 +480,7 @@ class RecipeSearchParams(BaseModel):
             return None
 
         # Remove potentially dangerous characters
-        if re.search(r'[<>"\';]', clean_query):
+        if UNSAFE_SEARCH_CHARS_RE.search(clean_query):
             raise ValueError("Search query contains invalid characters")
 
         return clean_query
@@ -506,20 +511,22 @@ class SuccessResponse(BaseModel):
     data: Optional[Dict[str, Any]] = None
 
 
-# Pagination response schema
-class PaginatedResponse(BaseModel):
-    items: List[Recipe]
-    total: int = Field(..., description="Total number of items")
-    page: int = Field(..., description="Current page number (1-based)")
-    pages: int = Field(..., description="Total number of pages")
-    per_page: int = Field(..., description="Items per page")
-    has_next: bool = Field(..., description="Whether there is a next page")
-    has_prev: bool = Field(..., description="Whether there is a previous page")
+# Pagination response schemas
+class PaginatedBase(BaseModel):
+    """Constructors shared by the paginated list responses
+
+    Subclasses declare ``items`` and the pagination fields.
+    """
+
+    @staticmethod
+    def _page_count(total: Optional[int], per_page: int) -> Optional[int]:
+        return None if total is None else (total + per_page - 1) // per_page
 
     @classmethod
-    def paginate(cls, items: List[Recipe], total: int, page: int, per_page: int):
+    def paginate(cls, items: list, total: int, page: int, per_page: int):
         """Helper method to create paginated response"""
-        total_pages = (total + per_page - 1) // per_page  # Ceiling division
+        total_pages = cls._page_count(total, per_page)
+        has_next = page < total_pages
 
         return cls(
             items=items,
@@ -527,31 +534,75 @@ class PaginatedResponse(BaseModel):
             page=page,
             pages=total_pages,
             per_page=per_page,
-            has_next=page < total_pages,
+            has_next=has_next,
             has_prev=page > 1,
+            next_cursor=items[-1].id if has_next and items else None,
         )
 
+    @classmethod
+    def paginate_lookahead(cls, items: list, page: int, per_page: int):
+        """Helper method to create a paginated response without a total count"""
+        return cls._from_lookahead(items, None, page, per_page, has_prev=page > 1)
 
-class PaginatedMealPlansResponse(BaseModel):
-    items: List[MealPlan]
-    total: int = Field(..., description="Total number of items")
-    page: int = Field(..., description="Current page number (1-based)")
-    pages: int = Field(..., description="Total number of pages")
-    per_page: int = Field(..., description="Items per page")
-    has_next: bool = Field(..., description="Whether there is a next page")
-    has_prev: bool = Field(..., description="Whether there is a previous page")
+    @classmethod
+    def from_cursor(cls, items: list, total: Optional[int], cursor: int, per_page: int):
+        """Helper method to create a keyset-paginated response"""
+        return cls._from_lookahead(items, total, 1, per_page, has_prev=cursor > 0)
 
     @classmethod
-    def paginate(cls, items: List[MealPlan], total: int, page: int, per_page: int):
-        """Helper method to create paginated response"""
-        total_pages = (total + per_page - 1) // per_page  # Ceiling division
+    def _from_lookahead(
+        cls,
+        items: list,
+        total: Optional[int],
+        page: int,
+        per_page: int,
+        has_prev: bool,
+    ):
+        """Build a page from a query fetched with one row of lookahead.
+
+        ``items`` is expected to hold up to ``per_page + 1`` rows; the extra
+        row only signals that another page exists and is not returned.
+        """
+        has_next = len(items) > per_page
+        items = items[:per_page]
 
         return cls(
             items=items,
             total=total,
             page=page,
-            pages=total_pages,
+            pages=cls._page_count(total, per_page),
             per_page=per_page,
-            has_next=page < total_pages,
-            has_prev=page > 1,
+            has_next=has_next,
+            has_prev=has_prev,
+            next_cursor=items[-1].id if has_next else None,
         )
+
+
+class PaginatedResponse(PaginatedBase):
+    items: List[Recipe]
+    total: Optional[int] = Field(
+        ..., description="Total number of items (null when include_total=false)"
+    )
+    page: int = Field(..., description="Current page number (1-based)")
+    pages: Optional[int] = Field(
+        ..., description="Total number of pages (null when include_total=false)"
+    )
+    per_page: int = Field(..., description="Items per page")
+    has_next: bool = Field(..., description="Whether there is a next page")
+    has_prev: bool = Field(..., description="Whether there is a previous page")
+    next_cursor: Optional[int] = Field(
+        None, description="Cursor for fetching the next page, if any"
+    )
+
+
+class PaginatedMealPlansResponse(PaginatedBase):
+    items: List[MealPlan]
+    total: int = Field(..., description="Total number of items")
+    page: int = Field(..., description="Current page number (1-based)")
+    pages: int = Field(..., description="Total number of pages")
+    per_page: int = Field(..., description="Items per page")
+    has_next: bool = Field(..., description="Whether there is a next page")
+    has_prev: bool = Field(..., description="Whether there is a previous page")
+    next_cursor: Optional[int] = Field(
+        None, description="Cursor for fetching the next page, if any"
+    )
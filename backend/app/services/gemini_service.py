@@ -24,7 +24,15 @@ class GeminiTimeoutError(Exception):
 
 
 class GeminiService:
-    def __init__(self):
+    def __init__(self, connector: Optional[aiohttp.BaseConnector] = None):
+        """
+        Set up the async and fallback Gemini clients
+        
+        Args:
+            connector: Shared aiohttp connector to keep Gemini connections (and
+                their DNS lookups) alive across calls; the caller closes it.
+                Without one, each call opens and closes its own.
+        """
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise ValueError("GEMINI_API_KEY environment variable is required")
@@ -44,6 +52,7 @@ class GeminiService:
         
         # Session will be created per request
         self.session = None
+        self.connector = connector
 
         # Define dietary restriction mappings
         self.dietary_restrictions = {
@@ -282,8 +291,12 @@ class GeminiService:
                 "x-goog-api-key": self.api_key
             }
             
-            # Create session for this request
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+            # Create session for this request, over the shared connector if there is one
+            async with aiohttp.ClientSession(
+                connector=self.connector,
+                connector_owner=self.connector is None,
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as session:
                 logger.info("📡 Making async HTTP request to Gemini API")
                 
                 async with session.post(self.base_url, json=payload, headers=headers) as response:
@@ -2,20 +2,31 @@
 Pytest configuration and shared fixtures for API testing
 """
 
+import os
 import pytest
+import pytest_asyncio
 import asyncio
+import threading
+import orjson
 from typing import AsyncGenerator, Generator
-from httpx import AsyncClient
-from sqlalchemy import create_engine, StaticPool
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, event, insert, StaticPool
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 
+# Keep the app's own engine in memory too, so importing app.main never
+# creates ./recipe_app.db; every test request goes through override_get_db
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
 from app.main import app
 from app.database import get_db, Base
 from app.models import Recipe, MealPlan
+from helpers import assert_status
 
-# Use in-memory SQLite for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Use in-memory SQLite for testing. The shared-cache URI lets every
+# connection in this process open the same database; each pytest-xdist
+# worker is its own process and so gets a separate one
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:memdb?mode=memory&cache=shared&uri=true"
 
 # Create test engine with special configuration for SQLite
 engine = create_engine(
@@ -29,13 +40,16 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def override_get_db():
-    """Override database dependency for testing"""
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
+# pysqlite manages transactions on its own and breaks SAVEPOINT handling;
+# hand BEGIN over to SQLAlchemy so per-test rollbacks work
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(connection):
+    connection.exec_driver_sql("BEGIN")
 
 
 @pytest.fixture(scope="session")
@@ -46,33 +60,127 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database session for each test"""
-    # Create all tables
+@pytest.fixture(scope="session")
+def db_schema():
+    """Create all tables once for the test session"""
     Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session(db_schema):
+    """Run each test inside a transaction that is rolled back afterwards"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    # Requests share one connection, so their savepoints must not interleave.
+    # The lock serves requests one at a time: requests a test sends together
+    # with asyncio.gather are batched on the client, not run concurrently
+    connection_lock = threading.Lock()
+
+    def override_get_db():
+        """Override database dependency for testing"""
+        with connection_lock:
+            # Commits inside the app only release a SAVEPOINT on the outer transaction
+            db = TestingSessionLocal(
+                bind=connection, join_transaction_mode="create_savepoint"
+            )
+            try:
+                yield db
+            finally:
+                db.close()
 
     # Override the dependency
     app.dependency_overrides[get_db] = override_get_db
 
-    yield TestingSessionLocal()
+    session = TestingSessionLocal(
+        bind=connection, join_transaction_mode="create_savepoint"
+    )
+    yield session
+    session.close()
 
     # Clean up
-    Base.metadata.drop_all(bind=engine)
+    transaction.rollback()
+    connection.close()
     app.dependency_overrides.clear()
 
 
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client for the FastAPI app"""
+@pytest.fixture(scope="session")
+def app_client():
+    """Create a single test client so the app lifespan is entered once per session"""
     with TestClient(app) as test_client:
         yield test_client
 
 
+@pytest.fixture(scope="session", autouse=True)
+def warm_up_routes(db_schema, app_client):
+    """Hit the main routes once so the first timed test doesn't pay for
+    SQLAlchemy statement compilation and other first-request work"""
+    connection = engine.connect()
+    transaction = connection.begin()
+
+    def override_get_db():
+        db = TestingSessionLocal(
+            bind=connection, join_transaction_mode="create_savepoint"
+        )
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        responses = [
+            app_client.post(
+                "/api/recipes",
+                json={
+                    "title": "Warm-up Recipe",
+                    "instructions": "1. Warm up. 2. Roll back.",
+                    "ingredients": [{"name": "salt", "amount": "1", "unit": "tsp"}],
+                },
+            ),
+            app_client.get("/api/recipes"),
+            app_client.get("/api/recipes/search", params={"q": "warm"}),
+            app_client.get("/api/meal-plans"),
+        ]
+        # A broken route should fail here, not as a confusing timing failure later
+        for response in responses:
+            assert_status(response, 200)
+    finally:
+        # Nothing written here may leak into the tests
+        app.dependency_overrides.pop(get_db, None)
+        transaction.rollback()
+        connection.close()
+    yield
+
+
+@pytest.fixture(scope="function")
+def client(db_session, app_client):
+    """Provide the shared test client bound to a fresh database"""
+    yield app_client
+
+
 @pytest.fixture(scope="function")
+def post_json(client):
+    """POST helper that serializes JSON bodies with orjson"""
+
+    def _post_json(url, payload):
+        return client.post(
+            url,
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+
+    return _post_json
+
+
+@pytest_asyncio.fixture(scope="function")
 async def async_client(db_session):
     """Create an async test client for the FastAPI app"""
-    async with AsyncClient(app=app, base_url="http://test") as async_test_client:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as async_test_client:
         yield async_test_client
 
 
@@ -138,7 +246,10 @@ def sample_vegetarian_recipe_data():
 
 @pytest.fixture
 def sample_meal_plan_data():
-    """Sample meal plan data for testing"""
+    """Sample meal plan data for testing
+
+    Built from a literal on every call, so tests can mutate it freely.
+    """
     return {
         "name": "Test Weekly Plan",
         "recipes": {
@@ -187,19 +298,44 @@ def multiple_recipes_data():
 
 
 @pytest.fixture
-def created_recipe(client, sample_recipe_data):
-    """Create a recipe and return its data"""
-    response = client.post("/api/recipes", json=sample_recipe_data)
-    assert response.status_code == 200
-    return response.json()
+def created_recipe(bulk_insert_recipes, sample_recipe_data):
+    """Insert a recipe (no HTTP round-trip) and return its data with the new ID"""
+    (recipe_id,) = bulk_insert_recipes([sample_recipe_data])
+    return {**sample_recipe_data, "id": recipe_id}
+
+
+@pytest.fixture
+def bulk_insert_recipes(db_session):
+    """Insert recipe rows directly with one INSERT ... RETURNING and return their IDs"""
+
+    def _bulk_insert_recipes(recipes):
+        result = db_session.execute(
+            insert(Recipe).returning(Recipe.id, sort_by_parameter_order=True), recipes
+        )
+        recipe_ids = list(result.scalars())
+        db_session.commit()
+        return recipe_ids
+
+    return _bulk_insert_recipes
+
+
+@pytest.fixture
+def bulk_create_recipes(bulk_insert_recipes, sample_recipe_data):
+    """Insert copies of the sample recipe and return their IDs"""
+
+    def _bulk_create_recipes(n, title_prefix="Test Recipe"):
+        return bulk_insert_recipes(
+            [{**sample_recipe_data, "title": f"{title_prefix} {i+1}"} for i in range(n)]
+        )
+
+    return _bulk_create_recipes
 
 
 @pytest.fixture
-def created_multiple_recipes(client, multiple_recipes_data):
+def created_multiple_recipes(bulk_insert_recipes, multiple_recipes_data):
     """Create multiple recipes for testing pagination"""
-    created_recipes = []
-    for recipe_data in multiple_recipes_data:
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 200
-        created_recipes.append(response.json())
-    return created_recipes
+    recipe_ids = bulk_insert_recipes(multiple_recipes_data)
+    return [
+        {**recipe_data, "id": recipe_id}
+        for recipe_data, recipe_id in zip(multiple_recipes_data, recipe_ids)
+    ]
@@ -0,0 +1,17 @@
+"""
+Response helpers shared by the API test modules
+"""
+
+import orjson
+
+
+def response_json(response):
+    """Decode a response body with orjson instead of stdlib json"""
+    return orjson.loads(response.content)
+
+
+def assert_status(response, status_code):
+    """Assert the status code, showing the start of the body on failure"""
+    assert (
+        response.status_code == status_code
+    ), f"{response.status_code} != {status_code}: {response.content[:200]!r}"
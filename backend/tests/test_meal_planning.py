@@ -5,18 +5,49 @@ Comprehensive tests for meal planning functionality
 import pytest
 from fastapi.testclient import TestClient
 
+from app import crud, schemas
+
+# Meal plan payloads the API must reject with 422
+INVALID_MEAL_PLAN_PAYLOADS = [
+    pytest.param({"recipes": {"monday": [1]}}, id="missing_name"),
+    # Less than 3 characters
+    pytest.param({"name": "AB", "recipes": {"monday": [1]}}, id="short_name"),
+    # More than 100 characters
+    pytest.param({"name": "A" * 101, "recipes": {"monday": [1]}}, id="long_name"),
+    pytest.param({"name": "Empty Meal Plan", "recipes": {}}, id="empty_recipes"),
+    pytest.param(
+        {"name": "Invalid Day Plan", "recipes": {"invalidday": [1], "monday": [2]}},
+        id="invalid_day",
+    ),
+    # Recipe IDs must be positive
+    pytest.param(
+        {"name": "Invalid Recipe Plan", "recipes": {"monday": [0], "tuesday": [-1]}},
+        id="invalid_recipe_id",
+    ),
+    # 11 recipe IDs (more than max 10)
+    pytest.param(
+        {"name": "Overloaded Day Plan", "recipes": {"monday": list(range(1, 12))}},
+        id="too_many_recipes_per_day",
+    ),
+    # Should be a list, not an integer
+    pytest.param(
+        {"name": "Invalid Format Plan", "recipes": {"monday": 1}},
+        id="recipes_not_list",
+    ),
+]
+
 
 class TestMealPlanning:
     """Test cases for meal planning operations"""
 
-    def test_create_meal_plan_success(self, client: TestClient, sample_recipe_data):
+    def test_create_meal_plan_success(self, post_json, sample_recipe_data):
         """Test successful meal plan creation"""
         # First create some recipes
         recipe_ids = []
         for i in range(3):
             recipe_data = sample_recipe_data.copy()
             recipe_data["title"] = f"Test Recipe {i+1}"
-            create_response = client.post("/api/recipes", json=recipe_data)
+            create_response = post_json("/api/recipes", recipe_data)
             assert create_response.status_code == 200
             recipe_ids.append(create_response.json()["id"])
 
@@ -30,7 +61,7 @@ class TestMealPlanning:
             }
         }
 
-        response = client.post("/api/meal-plans", json=meal_plan_data)
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -39,106 +70,18 @@ class TestMealPlanning:
         assert "created_at" in data
         assert data["recipes"] == meal_plan_data["recipes"]
 
-    def test_create_meal_plan_missing_name(self, client: TestClient):
-        """Test meal plan creation fails without name"""
-        meal_plan_data = {
-            "recipes": {
-                "monday": [1]
-            }
-        }
-
-        response = client.post("/api/meal-plans", json=meal_plan_data)
-        assert response.status_code == 422
-
-    def test_create_meal_plan_short_name(self, client: TestClient):
-        """Test meal plan creation with name too short"""
-        meal_plan_data = {
-            "name": "AB",  # Less than 3 characters
-            "recipes": {
-                "monday": [1]
-            }
-        }
-
-        response = client.post("/api/meal-plans", json=meal_plan_data)
-        assert response.status_code == 422
-
-    def test_create_meal_plan_long_name(self, client: TestClient):
-        """Test meal plan creation with name too long"""
-        meal_plan_data = {
-            "name": "A" * 101,  # More than 100 characters
-            "recipes": {
-                "monday": [1]
-            }
-        }
-
-        response = client.post("/api/meal-plans", json=meal_plan_data)
-        assert response.status_code == 422
-
-    def test_create_meal_plan_empty_recipes(self, client: TestClient):
-        """Test meal plan creation with empty recipes"""
-        meal_plan_data = {
-            "name": "Empty Meal Plan",
-            "recipes": {}
-        }
-
-        response = client.post("/api/meal-plans", json=meal_plan_data)
+    @pytest.mark.parametrize("meal_plan_data", INVALID_MEAL_PLAN_PAYLOADS)
+    def test_create_meal_plan_rejects_invalid(self, post_json, meal_plan_data):
+        """Test meal plan creation fails for invalid payloads"""
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 422
 
-    def test_create_meal_plan_invalid_day(self, client: TestClient):
-        """Test meal plan creation with invalid day names"""
-        meal_plan_data = {
-            "name": "Invalid Day Plan",
-            "recipes": {
-                "invalidday": [1],
-                "monday": [2]
-            }
-        }
-
-        response = client.post("/api/meal-plans", json=meal_plan_data)
-        assert response.status_code == 422
-
-    def test_create_meal_plan_invalid_recipe_id(self, client: TestClient):
-        """Test meal plan creation with invalid recipe IDs"""
-        meal_plan_data = {
-            "name": "Invalid Recipe Plan",
-            "recipes": {
-                "monday": [0],  # Invalid recipe ID (must be positive)
-                "tuesday": [-1]  # Invalid recipe ID
-            }
-        }
-
-        response = client.post("/api/meal-plans", json=meal_plan_data)
-        assert response.status_code == 422
-
-    def test_create_meal_plan_too_many_recipes_per_day(self, client: TestClient):
-        """Test meal plan creation with too many recipes per day"""
-        recipe_ids = list(range(1, 12))  # 11 recipe IDs (more than max 10)
-        
-        meal_plan_data = {
-            "name": "Overloaded Day Plan",
-            "recipes": {
-                "monday": recipe_ids
-            }
-        }
-
-        response = client.post("/api/meal-plans", json=meal_plan_data)
-        assert response.status_code == 422
-
-    def test_create_meal_plan_maximum_recipes_per_day(self, client: TestClient):
+    def test_create_meal_plan_maximum_recipes_per_day(
+        self, post_json, bulk_create_recipes
+    ):
         """Test meal plan creation with maximum allowed recipes per day"""
         # First create 10 recipes
-        recipe_ids = []
-        for i in range(10):
-            recipe_data = {
-                "title": f"Recipe {i+1}",
-                "instructions": "Cook properly.",
-                "ingredients": [
-                    {"name": f"ingredient_{i}", "amount": "1", "unit": "cup", "notes": None}
-                ]
-            }
-            create_response = client.post("/api/recipes", json=recipe_data)
-            assert create_response.status_code == 200
-            recipe_ids.append(create_response.json()["id"])
+        recipe_ids = bulk_create_recipes(10, "Recipe")
 
         meal_plan_data = {
             "name": "Maximum Recipes Plan",
@@ -147,10 +90,10 @@ class TestMealPlanning:
             }
         }
 
-        response = client.post("/api/meal-plans", json=meal_plan_data)
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 200
 
-    def test_get_meal_plans_pagination(self, client: TestClient):
+    def test_get_meal_plans_pagination(self, client: TestClient, post_json):
         """Test meal plan retrieval with pagination"""
         response = client.get("/api/meal-plans?page=1&page_size=5")
         assert response.status_code == 200
@@ -163,6 +106,36 @@ class TestMealPlanning:
         assert "per_page" in data
         assert "has_next" in data
         assert "has_prev" in data
+        assert "next_cursor" in data
+
+        # Seed meal plans and page through them with a cursor
+        for i in range(20):
+            meal_plan_data = {"name": f"Cursor Plan {i+1}", "recipes": {"monday": []}}
+            create_response = post_json("/api/meal-plans", meal_plan_data)
+            assert create_response.status_code == 200
+
+        seen_ids = []
+        cursor = 0
+        while cursor is not None:
+            response = client.get(f"/api/meal-plans?cursor={cursor}&page_size=5")
+            assert response.status_code == 200
+
+            data = response.json()
+            assert "next_cursor" in data
+            assert len(data["items"]) <= 5
+            seen_ids.extend(item["id"] for item in data["items"])
+
+            # A plan inserted mid-walk lands after the cursor, not on a seen page
+            if len(seen_ids) == 5:
+                meal_plan_data = {"name": "Late Plan", "recipes": {"monday": []}}
+                create_response = post_json("/api/meal-plans", meal_plan_data)
+                assert create_response.status_code == 200
+
+            cursor = data["next_cursor"]
+
+        assert len(seen_ids) == 21
+        assert len(set(seen_ids)) == len(seen_ids)
+        assert seen_ids == sorted(seen_ids)
 
     def test_get_meal_plans_invalid_pagination(self, client: TestClient):
         """Test meal plan retrieval with invalid pagination"""
@@ -176,10 +149,12 @@ class TestMealPlanning:
         data = response.json()
         assert data["per_page"] == 10  # Should be capped at 10
 
-    def test_get_meal_plan_by_id_success(self, client: TestClient, sample_recipe_data):
+    def test_get_meal_plan_by_id_success(
+        self, client: TestClient, post_json, sample_recipe_data
+    ):
         """Test successful meal plan retrieval by ID"""
         # First create a recipe
-        create_recipe_response = client.post("/api/recipes", json=sample_recipe_data)
+        create_recipe_response = post_json("/api/recipes", sample_recipe_data)
         assert create_recipe_response.status_code == 200
         recipe_id = create_recipe_response.json()["id"]
 
@@ -191,7 +166,7 @@ class TestMealPlanning:
             }
         }
 
-        create_response = client.post("/api/meal-plans", json=meal_plan_data)
+        create_response = post_json("/api/meal-plans", meal_plan_data)
         assert create_response.status_code == 200
         meal_plan_id = create_response.json()["id"]
 
@@ -213,10 +188,12 @@ class TestMealPlanning:
         response = client.get("/api/meal-plans/invalid")
         assert response.status_code == 422
 
-    def test_delete_meal_plan_success(self, client: TestClient, sample_recipe_data):
+    def test_delete_meal_plan_success(
+        self, client: TestClient, post_json, sample_recipe_data
+    ):
         """Test successful meal plan deletion"""
         # First create a recipe
-        create_recipe_response = client.post("/api/recipes", json=sample_recipe_data)
+        create_recipe_response = post_json("/api/recipes", sample_recipe_data)
         assert create_recipe_response.status_code == 200
         recipe_id = create_recipe_response.json()["id"]
 
@@ -228,7 +205,7 @@ class TestMealPlanning:
             }
         }
 
-        create_response = client.post("/api/meal-plans", json=meal_plan_data)
+        create_response = post_json("/api/meal-plans", meal_plan_data)
         assert create_response.status_code == 200
         meal_plan_id = create_response.json()["id"]
 
@@ -240,21 +217,26 @@ class TestMealPlanning:
         get_response = client.get(f"/api/meal-plans/{meal_plan_id}")
         assert get_response.status_code == 404
 
+    def test_delete_meal_plan_service_layer(self, db_session):
+        """Test meal plan deletion through the CRUD layer, without HTTP"""
+        meal_plan = schemas.MealPlanCreate(
+            name="Service Layer Plan", recipes={"monday": []}
+        )
+        meal_plan_id = crud.create_meal_plan(db_session, meal_plan=meal_plan).id
+
+        assert crud.delete_meal_plan(db_session, meal_plan_id=meal_plan_id) is True
+        assert crud.get_meal_plan(db_session, meal_plan_id=meal_plan_id) is None
+        assert crud.delete_meal_plan(db_session, meal_plan_id=meal_plan_id) is False
+
     def test_delete_meal_plan_not_found(self, client: TestClient):
         """Test meal plan deletion with non-existent ID"""
         response = client.delete("/api/meal-plans/99999")
         assert response.status_code == 404
 
-    def test_meal_plan_with_all_days(self, client: TestClient, sample_recipe_data):
+    def test_meal_plan_with_all_days(self, post_json, bulk_create_recipes):
         """Test meal plan creation with all days of the week"""
         # Create recipes for each day
-        recipe_ids = []
-        for i in range(7):
-            recipe_data = sample_recipe_data.copy()
-            recipe_data["title"] = f"Day {i+1} Recipe"
-            create_response = client.post("/api/recipes", json=recipe_data)
-            assert create_response.status_code == 200
-            recipe_ids.append(create_response.json()["id"])
+        recipe_ids = bulk_create_recipes(7, "Day Recipe")
 
         days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
         meal_plan_data = {
@@ -262,16 +244,16 @@ class TestMealPlanning:
             "recipes": {day: [recipe_ids[i]] for i, day in enumerate(days)}
         }
 
-        response = client.post("/api/meal-plans", json=meal_plan_data)
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 200
 
         data = response.json()
         assert len(data["recipes"]) == 7
 
-    def test_meal_plan_case_insensitive_days(self, client: TestClient, sample_recipe_data):
+    def test_meal_plan_case_insensitive_days(self, post_json, sample_recipe_data):
         """Test meal plan with case variations in day names"""
         # Create a recipe
-        create_recipe_response = client.post("/api/recipes", json=sample_recipe_data)
+        create_recipe_response = post_json("/api/recipes", sample_recipe_data)
         assert create_recipe_response.status_code == 200
         recipe_id = create_recipe_response.json()["id"]
 
@@ -283,13 +265,13 @@ class TestMealPlanning:
             }
         }
 
-        response = client.post("/api/meal-plans", json=meal_plan_data)
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 422
 
-    def test_meal_plan_duplicate_recipes_same_day(self, client: TestClient, sample_recipe_data):
+    def test_meal_plan_duplicate_recipes_same_day(self, post_json, sample_recipe_data):
         """Test meal plan with duplicate recipes on the same day"""
         # Create a recipe
-        create_recipe_response = client.post("/api/recipes", json=sample_recipe_data)
+        create_recipe_response = post_json("/api/recipes", sample_recipe_data)
         assert create_recipe_response.status_code == 200
         recipe_id = create_recipe_response.json()["id"]
 
@@ -300,10 +282,10 @@ class TestMealPlanning:
             }
         }
 
-        response = client.post("/api/meal-plans", json=meal_plan_data)
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 200  # Should be allowed
 
-    def test_meal_plan_with_nonexistent_recipe(self, client: TestClient):
+    def test_meal_plan_with_nonexistent_recipe(self, post_json):
         """Test meal plan creation with non-existent recipe ID"""
         meal_plan_data = {
             "name": "Invalid Recipe Plan",
@@ -312,33 +294,16 @@ class TestMealPlanning:
             }
         }
 
-        response = client.post("/api/meal-plans", json=meal_plan_data)
-        # This might succeed at creation but fail when retrieving
-        # The actual behavior depends on foreign key constraints
-        assert response.status_code in [200, 422, 400]
-
-    def test_meal_plan_recipes_not_list(self, client: TestClient):
-        """Test meal plan creation with non-list recipe values"""
-        meal_plan_data = {
-            "name": "Invalid Format Plan",
-            "recipes": {
-                "monday": 1  # Should be a list, not an integer
-            }
-        }
-
-        response = client.post("/api/meal-plans", json=meal_plan_data)
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 422
 
-    def test_meal_plan_comprehensive_validation(self, client: TestClient, sample_recipe_data):
+        error_data = response.json()
+        assert "99999" in error_data["detail"]
+
+    def test_meal_plan_comprehensive_validation(self, post_json, bulk_create_recipes):
         """Test comprehensive meal plan validation"""
         # Create multiple recipes
-        recipe_ids = []
-        for i in range(5):
-            recipe_data = sample_recipe_data.copy()
-            recipe_data["title"] = f"Validation Recipe {i+1}"
-            create_response = client.post("/api/recipes", json=recipe_data)
-            assert create_response.status_code == 200
-            recipe_ids.append(create_response.json()["id"])
+        recipe_ids = bulk_create_recipes(5, "Validation Recipe")
 
         # Valid meal plan
         meal_plan_data = {
@@ -351,7 +316,7 @@ class TestMealPlanning:
             }
         }
 
-        response = client.post("/api/meal-plans", json=meal_plan_data)
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -5,11 +5,40 @@ Tests for meal planning API endpoints
 import pytest
 from fastapi.testclient import TestClient
 
+WEEK_DAYS = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+
+def _week_plan(name, **days):
+    """Build a meal plan payload covering the whole week"""
+    recipes = {day: days.get(day, []) for day in WEEK_DAYS}
+    return {"name": name, "recipes": recipes}
+
+
+# Meal plan payloads the API must reject with 422
+INVALID_MEAL_PLAN_PAYLOADS = [
+    pytest.param(_week_plan(""), id="empty_name"),
+    # Assuming 200 char limit
+    pytest.param(_week_plan("A" * 201), id="long_name"),
+    # String instead of int
+    pytest.param(
+        _week_plan("Invalid Plan", Monday=["invalid_id"]), id="string_recipe_id"
+    ),
+    pytest.param(_week_plan("Invalid Plan", Monday=[-1]), id="negative_recipe_id"),
+]
+
 
 class TestMealPlanAPI:
     """Test cases for meal planning functionality"""
 
-    def test_create_meal_plan_success(self, client: TestClient, sample_meal_plan_data):
+    def test_create_meal_plan_success(self, post_json, sample_meal_plan_data):
         """Test successful meal plan creation"""
         # First create some recipes
         recipe_data = {
@@ -20,7 +49,7 @@ class TestMealPlanAPI:
             "difficulty": "Easy",
         }
 
-        response = client.post("/api/recipes", json=recipe_data)
+        response = post_json("/api/recipes", recipe_data)
         assert response.status_code == 200
         recipe_id = response.json()["id"]
 
@@ -28,7 +57,7 @@ class TestMealPlanAPI:
         sample_meal_plan_data["recipes"]["Monday"] = [recipe_id]
         sample_meal_plan_data["recipes"]["Tuesday"] = [recipe_id]
 
-        response = client.post("/api/meal-plans", json=sample_meal_plan_data)
+        response = post_json("/api/meal-plans", sample_meal_plan_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -39,7 +68,7 @@ class TestMealPlanAPI:
         assert data["recipes"]["Monday"] == [recipe_id]
         assert data["recipes"]["Tuesday"] == [recipe_id]
 
-    def test_create_meal_plan_validation_errors(self, client: TestClient):
+    def test_create_meal_plan_validation_errors(self, post_json):
         """Test meal plan creation with validation errors"""
         # Test missing name
         invalid_data = {
@@ -54,30 +83,30 @@ class TestMealPlanAPI:
             }
         }
 
-        response = client.post("/api/meal-plans", json=invalid_data)
+        response = post_json("/api/meal-plans", invalid_data)
         assert response.status_code == 422
 
         # Test missing recipes
         invalid_data_no_recipes = {"name": "Test Plan"}
 
-        response = client.post("/api/meal-plans", json=invalid_data_no_recipes)
+        response = post_json("/api/meal-plans", invalid_data_no_recipes)
         assert response.status_code == 422
 
     def test_create_meal_plan_invalid_recipe_ids(
-        self, client: TestClient, sample_meal_plan_data
+        self, post_json, sample_meal_plan_data
     ):
         """Test meal plan creation with non-existent recipe IDs"""
         # Use non-existent recipe IDs
         sample_meal_plan_data["recipes"]["Monday"] = [99999]
 
-        response = client.post("/api/meal-plans", json=sample_meal_plan_data)
+        response = post_json("/api/meal-plans", sample_meal_plan_data)
         assert response.status_code == 422
 
         error_data = response.json()
         assert "detail" in error_data
         assert "recipe" in str(error_data["detail"]).lower()
 
-    def test_create_meal_plan_invalid_day_names(self, client: TestClient):
+    def test_create_meal_plan_invalid_day_names(self, post_json):
         """Test meal plan creation with invalid day names"""
         invalid_data = {
             "name": "Test Plan",
@@ -92,25 +121,23 @@ class TestMealPlanAPI:
             },
         }
 
-        response = client.post("/api/meal-plans", json=invalid_data)
+        response = post_json("/api/meal-plans", invalid_data)
         assert response.status_code == 422
 
         error_data = response.json()
         assert "detail" in error_data
 
-    def test_create_meal_plan_empty_recipes(
-        self, client: TestClient, sample_meal_plan_data
-    ):
+    def test_create_meal_plan_empty_recipes(self, post_json, sample_meal_plan_data):
         """Test meal plan creation with empty recipes (should be allowed)"""
         # All days have empty recipe lists
-        response = client.post("/api/meal-plans", json=sample_meal_plan_data)
+        response = post_json("/api/meal-plans", sample_meal_plan_data)
         assert response.status_code == 200
 
         data = response.json()
         assert data["name"] == sample_meal_plan_data["name"]
         assert all(len(recipes) == 0 for recipes in data["recipes"].values())
 
-    def test_get_meal_plans_pagination(self, client: TestClient):
+    def test_get_meal_plans_pagination(self, client: TestClient, post_json):
         """Test meal plans pagination"""
         # Create multiple meal plans
         for i in range(5):
@@ -127,7 +154,7 @@ class TestMealPlanAPI:
                 },
             }
 
-            response = client.post("/api/meal-plans", json=meal_plan_data)
+            response = post_json("/api/meal-plans", meal_plan_data)
             assert response.status_code == 200
 
         # Test pagination
@@ -153,10 +180,12 @@ class TestMealPlanAPI:
         assert data["total"] == 0
         assert len(data["items"]) == 0
 
-    def test_get_meal_plan_by_id(self, client: TestClient, sample_meal_plan_data):
+    def test_get_meal_plan_by_id(
+        self, client: TestClient, post_json, sample_meal_plan_data
+    ):
         """Test retrieving meal plan by ID"""
         # Create meal plan
-        response = client.post("/api/meal-plans", json=sample_meal_plan_data)
+        response = post_json("/api/meal-plans", sample_meal_plan_data)
         assert response.status_code == 200
         meal_plan_id = response.json()["id"]
 
@@ -177,10 +206,12 @@ class TestMealPlanAPI:
         assert "detail" in error_data
         assert "meal plan not found" in error_data["detail"].lower()
 
-    def test_delete_meal_plan_success(self, client: TestClient, sample_meal_plan_data):
+    def test_delete_meal_plan_success(
+        self, client: TestClient, post_json, sample_meal_plan_data
+    ):
         """Test successful meal plan deletion"""
         # Create meal plan
-        response = client.post("/api/meal-plans", json=sample_meal_plan_data)
+        response = post_json("/api/meal-plans", sample_meal_plan_data)
         assert response.status_code == 200
         meal_plan_id = response.json()["id"]
 
@@ -201,7 +232,7 @@ class TestMealPlanAPI:
         assert "detail" in error_data
         assert "meal plan not found" in error_data["detail"].lower()
 
-    def test_meal_plan_with_multiple_recipes(self, client: TestClient):
+    def test_meal_plan_with_multiple_recipes(self, post_json):
         """Test meal plan with multiple recipes per day"""
         # Create multiple recipes
         recipe_ids = []
@@ -216,7 +247,7 @@ class TestMealPlanAPI:
                 "difficulty": "Easy",
             }
 
-            response = client.post("/api/recipes", json=recipe_data)
+            response = post_json("/api/recipes", recipe_data)
             assert response.status_code == 200
             recipe_ids.append(response.json()["id"])
 
@@ -234,7 +265,7 @@ class TestMealPlanAPI:
             },
         }
 
-        response = client.post("/api/meal-plans", json=meal_plan_data)
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -244,74 +275,8 @@ class TestMealPlanAPI:
         assert len(data["recipes"]["Thursday"]) == 0
         assert len(data["recipes"]["Friday"]) == 3
 
-    def test_meal_plan_recipe_validation(self, client: TestClient):
-        """Test meal plan recipe ID validation"""
-        # Test with invalid recipe ID types
-        invalid_meal_plan = {
-            "name": "Invalid Plan",
-            "recipes": {
-                "Monday": ["invalid_id"],  # String instead of int
-                "Tuesday": [],
-                "Wednesday": [],
-                "Thursday": [],
-                "Friday": [],
-                "Saturday": [],
-                "Sunday": [],
-            },
-        }
-
-        response = client.post("/api/meal-plans", json=invalid_meal_plan)
-        assert response.status_code == 422
-
-        # Test with negative recipe IDs
-        invalid_meal_plan_negative = {
-            "name": "Invalid Plan",
-            "recipes": {
-                "Monday": [-1],  # Negative ID
-                "Tuesday": [],
-                "Wednesday": [],
-                "Thursday": [],
-                "Friday": [],
-                "Saturday": [],
-                "Sunday": [],
-            },
-        }
-
-        response = client.post("/api/meal-plans", json=invalid_meal_plan_negative)
-        assert response.status_code == 422
-
-    def test_meal_plan_name_validation(self, client: TestClient):
-        """Test meal plan name validation"""
-        # Test empty name
-        invalid_data = {
-            "name": "",
-            "recipes": {
-                "Monday": [],
-                "Tuesday": [],
-                "Wednesday": [],
-                "Thursday": [],
-                "Friday": [],
-                "Saturday": [],
-                "Sunday": [],
-            },
-        }
-
-        response = client.post("/api/meal-plans", json=invalid_data)
-        assert response.status_code == 422
-
-        # Test very long name
-        invalid_data_long = {
-            "name": "A" * 201,  # Assuming 200 char limit
-            "recipes": {
-                "Monday": [],
-                "Tuesday": [],
-                "Wednesday": [],
-                "Thursday": [],
-                "Friday": [],
-                "Saturday": [],
-                "Sunday": [],
-            },
-        }
-
-        response = client.post("/api/meal-plans", json=invalid_data_long)
+    @pytest.mark.parametrize("meal_plan_data", INVALID_MEAL_PLAN_PAYLOADS)
+    def test_meal_plan_rejects_invalid(self, post_json, meal_plan_data):
+        """Test meal plan name and recipe ID validation"""
+        response = post_json("/api/meal-plans", meal_plan_data)
         assert response.status_code == 422
@@ -159,6 +159,51 @@ class TestPagination:
         # Check total count
         assert len(all_recipe_ids) == 15
 
+    def test_get_recipes_cursor_pagination(
+        self, client: TestClient, created_multiple_recipes
+    ):
+        """Test walking all recipes with keyset (cursor) pagination"""
+        seen_ids = []
+        cursor = 0
+
+        while cursor is not None:
+            response = client.get(
+                "/api/recipes", params={"cursor": cursor, "page_size": 4}
+            )
+            assert response.status_code == 200
+
+            data = response.json()
+            assert "next_cursor" in data
+            assert len(data["items"]) <= 4
+            assert data["total"] == 15
+            seen_ids.extend(recipe["id"] for recipe in data["items"])
+            cursor = data["next_cursor"]
+
+        assert len(seen_ids) == 15
+        assert seen_ids == sorted(set(seen_ids))
+
+    def test_get_recipes_without_total(
+        self, client: TestClient, created_multiple_recipes
+    ):
+        """Test pagination that skips the total count"""
+        response = client.get(
+            "/api/recipes", params={"page": 3, "page_size": 5, "include_total": False}
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total"] is None
+        assert data["pages"] is None
+        assert data["has_next"] == False
+        assert data["has_prev"] == True
+        assert len(data["items"]) == 5
+
+        response = client.get(
+            "/api/recipes", params={"page": 1, "page_size": 5, "include_total": False}
+        )
+        assert response.status_code == 200
+        assert response.json()["has_next"] == True
+
     def test_pagination_with_different_per_pages(
         self, client: TestClient, created_multiple_recipes
     ):
@@ -179,24 +224,12 @@ class TestPagination:
             expected_pages = (15 + per_page - 1) // per_page  # Ceiling division
             assert data["pages"] == expected_pages
 
-    def test_pagination_metadata_accuracy(self, client: TestClient):
+    def test_pagination_metadata_accuracy(
+        self, client: TestClient, bulk_create_recipes
+    ):
         """Test accuracy of pagination metadata with known data"""
         # Create exactly 7 recipes
-        for i in range(7):
-            recipe_data = {
-                "title": f"Recipe {i}",
-                "description": f"Description {i}",
-                "instructions": f"Instructions {i}",
-                "ingredients": [
-                    {"name": f"ingredient_{i}", "amount": "1", "unit": "cup"}
-                ],
-                "prep_time": 10,
-                "cook_time": 20,
-                "servings": 4,
-                "difficulty": "Easy",
-            }
-            response = client.post("/api/recipes", json=recipe_data)
-            assert response.status_code == 200
+        bulk_create_recipes(7, "Recipe")
 
         # Test per_page = 3
         response = client.get("/api/recipes", params={"per_page": 3})
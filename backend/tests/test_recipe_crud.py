@@ -2,15 +2,132 @@
 Comprehensive tests for recipe CRUD operations
 """
 
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch
+from numbers import Real
+from unittest.mock import MagicMock
+
+from app.database import get_db
+from app.main import app
+from app.models import Recipe
+from helpers import assert_status, response_json
+
+VALID_INGREDIENTS = [
+    {"name": "ingredient1", "amount": "1", "unit": "cup", "notes": None}
+]
+
+# Maximum ingredient count, built once at import
+LARGE_RECIPE_INGREDIENTS = tuple(
+    {"name": f"ingredient_{i}", "amount": "1", "unit": "cup", "notes": "notes"}
+    for i in range(50)
+)
+
+LARGE_RECIPE = {
+    "title": "A" * 200,  # Maximum title length
+    "description": "B" * 1000,  # Large description
+    "instructions": "C" * 5000,  # Large instructions
+    "ingredients": LARGE_RECIPE_INGREDIENTS,
+    "prep_time": 600,  # Maximum prep time
+    "cook_time": 1440,  # Maximum cook time
+    "servings": 20,  # Maximum servings
+    "difficulty": "Expert"
+}
+
+
+def _recipe(**fields):
+    """Build a valid recipe payload, overriding or removing (None) fields"""
+    recipe_data = {
+        "title": "Test Recipe",
+        "instructions": "Cook everything together properly.",
+        "ingredients": VALID_INGREDIENTS,
+    }
+    recipe_data.update(fields)
+    return {key: value for key, value in recipe_data.items() if value is not None}
+
+
+# Recipe payloads the API must reject with 422
+INVALID_RECIPE_PAYLOADS = [
+    pytest.param(_recipe(title=None), id="missing_title"),
+    pytest.param(_recipe(instructions=None), id="missing_instructions"),
+    pytest.param(_recipe(ingredients=[]), id="missing_ingredients"),
+    # Less than 3 characters
+    pytest.param(_recipe(title="AB"), id="title_too_short"),
+    # More than 200 characters
+    pytest.param(_recipe(title="A" * 201), id="title_too_long"),
+    # Less than 10 characters
+    pytest.param(_recipe(instructions="Short"), id="instructions_too_short"),
+    pytest.param(_recipe(difficulty="Impossible"), id="invalid_difficulty"),
+    pytest.param(_recipe(prep_time=-5), id="negative_prep_time"),
+    # More than 1440 minutes (24 hours)
+    pytest.param(_recipe(prep_time=15, cook_time=2000), id="excessive_cook_time"),
+    pytest.param(_recipe(servings=0), id="zero_servings"),
+    # More than 20
+    pytest.param(_recipe(servings=25), id="too_many_servings"),
+    # More than 50 ingredients
+    pytest.param(
+        _recipe(ingredients=LARGE_RECIPE_INGREDIENTS + (VALID_INGREDIENTS[0],)),
+        id="too_many_ingredients",
+    ),
+]
+
+# Keys every paginated listing response carries
+PAGINATION_KEYS = frozenset(
+    {"items", "total", "page", "pages", "per_page", "has_next", "has_prev"}
+)
+
+# Keys a freshly created recipe must echo back
+CREATED_RECIPE_KEYS = frozenset({"title", "description", "id", "created_at"})
+
+# Recipes straddling each search filter threshold:
+# (title, difficulty, rating, prep_time, cook_time)
+SEARCH_RECIPES = [
+    ("Pasta Primavera", "Easy", 4.5, 20, 30),
+    ("Beef Stew", "Hard", 3.5, 30, 120),
+    ("Pasta Carbonara", "Medium", 4.0, 31, 60),
+    ("Green Salad", "Easy", None, 10, 61),
+]
+
+# One search query per filter kind plus a combined one, with the indexes
+# into SEARCH_RECIPES each must return
+SEARCH_CASES = {
+    "q=pasta": [0, 2],
+    "difficulty=Easy": [0, 3],
+    "min_rating=4.0": [0, 2],
+    "max_prep_time=30": [0, 1, 3],
+    "max_cook_time=60": [0, 2],
+    "q=pasta&min_rating=4.0&max_prep_time=30&max_cook_time=60": [0],
+}
+
+
+@pytest.fixture(scope="class")
+def validation_client(app_client):
+    """Shared client whose database dependency is a MagicMock
+
+    Payloads here fail request validation before the handler runs, so
+    they never need a real session or the per-test transaction.
+    """
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    yield app_client
+    app.dependency_overrides.pop(get_db, None)
+
+
+class TestRecipeValidation:
+    """Test cases for recipe payloads rejected by request validation"""
+
+    @pytest.mark.parametrize("recipe_data", INVALID_RECIPE_PAYLOADS)
+    def test_create_recipe_rejects_invalid(
+        self, validation_client: TestClient, recipe_data
+    ):
+        """Test recipe creation fails for invalid payloads"""
+        response = validation_client.post("/api/recipes", json=recipe_data)
+        assert_status(response, 422)
 
 
 class TestRecipeCRUD:
     """Test cases for recipe CRUD operations"""
 
-    def test_create_recipe_success(self, client: TestClient):
+    def test_create_recipe_success(self, post_json):
         """Test successful recipe creation"""
         recipe_data = {
             "title": "Test Chicken Pasta",
@@ -26,16 +143,15 @@ class TestRecipeCRUD:
             "difficulty": "Easy"
         }
 
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 200
+        response = post_json("/api/recipes", recipe_data)
+        assert_status(response, 200)
 
-        data = response.json()
+        data = response_json(response)
+        assert CREATED_RECIPE_KEYS <= data.keys(), CREATED_RECIPE_KEYS - data.keys()
         assert data["title"] == recipe_data["title"]
         assert data["description"] == recipe_data["description"]
-        assert "id" in data
-        assert "created_at" in data
 
-    def test_create_recipe_minimal_data(self, client: TestClient):
+    def test_create_recipe_minimal_data(self, post_json):
         """Test recipe creation with minimal required data"""
         recipe_data = {
             "title": "Minimal Recipe",
@@ -45,309 +161,184 @@ class TestRecipeCRUD:
             ]
         }
 
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 200
+        response = post_json("/api/recipes", recipe_data)
+        assert_status(response, 200)
 
-    def test_create_recipe_missing_title(self, client: TestClient):
-        """Test recipe creation fails without title"""
-        recipe_data = {
-            "instructions": "Cook everything together.",
-            "ingredients": [
-                {"name": "ingredient1", "amount": "1", "unit": "cup", "notes": None}
-            ]
-        }
-
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
-
-    def test_create_recipe_missing_instructions(self, client: TestClient):
-        """Test recipe creation fails without instructions"""
-        recipe_data = {
-            "title": "Recipe Without Instructions",
-            "ingredients": [
-                {"name": "ingredient1", "amount": "1", "unit": "cup", "notes": None}
-            ]
-        }
-
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
-
-    def test_create_recipe_missing_ingredients(self, client: TestClient):
-        """Test recipe creation fails without ingredients"""
-        recipe_data = {
-            "title": "Recipe Without Ingredients",
-            "instructions": "Cook everything together.",
-            "ingredients": []
-        }
-
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
-
-    def test_create_recipe_invalid_title_length(self, client: TestClient):
-        """Test recipe creation with invalid title length"""
-        # Title too short
-        recipe_data = {
-            "title": "AB",  # Less than 3 characters
-            "instructions": "Cook everything together.",
-            "ingredients": [
-                {"name": "ingredient1", "amount": "1", "unit": "cup", "notes": None}
-            ]
-        }
-
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
-
-        # Title too long
-        recipe_data["title"] = "A" * 201  # More than 200 characters
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
-
-    def test_create_recipe_invalid_instructions_length(self, client: TestClient):
-        """Test recipe creation with invalid instructions length"""
-        recipe_data = {
-            "title": "Test Recipe",
-            "instructions": "Short",  # Less than 10 characters
-            "ingredients": [
-                {"name": "ingredient1", "amount": "1", "unit": "cup", "notes": None}
-            ]
-        }
-
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
-
-    def test_create_recipe_invalid_difficulty(self, client: TestClient):
-        """Test recipe creation with invalid difficulty"""
-        recipe_data = {
-            "title": "Test Recipe",
-            "instructions": "Cook everything together properly.",
-            "ingredients": [
-                {"name": "ingredient1", "amount": "1", "unit": "cup", "notes": None}
-            ],
-            "difficulty": "Impossible"  # Invalid difficulty
-        }
-
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
-
-    def test_create_recipe_invalid_time_values(self, client: TestClient):
-        """Test recipe creation with invalid time values"""
-        # Negative prep time
-        recipe_data = {
-            "title": "Test Recipe",
-            "instructions": "Cook everything together properly.",
-            "ingredients": [
-                {"name": "ingredient1", "amount": "1", "unit": "cup", "notes": None}
-            ],
-            "prep_time": -5
-        }
-
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
-
-        # Excessive cook time
-        recipe_data["prep_time"] = 15
-        recipe_data["cook_time"] = 2000  # More than 1440 minutes (24 hours)
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
-
-    def test_create_recipe_invalid_servings(self, client: TestClient):
-        """Test recipe creation with invalid servings"""
-        recipe_data = {
-            "title": "Test Recipe",
-            "instructions": "Cook everything together properly.",
-            "ingredients": [
-                {"name": "ingredient1", "amount": "1", "unit": "cup", "notes": None}
-            ],
-            "servings": 0  # Invalid servings
-        }
-
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
+    def test_create_recipe_large_payload(self, post_json):
+        """Test recipe creation with maximum allowed payload"""
+        response = post_json("/api/recipes", LARGE_RECIPE)
+        assert_status(response, 200)
+
+    def test_create_recipes_bulk_success(
+        self, post_json, client: TestClient, sample_recipe_data
+    ):
+        """Test creating several recipes in one bulk request"""
+        recipes = [
+            {**sample_recipe_data, "title": f"Bulk Recipe {i+1}"} for i in range(5)
+        ]
 
-        recipe_data["servings"] = 25  # More than 20
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
+        response = post_json("/api/recipes/bulk", recipes)
+        assert_status(response, 200)
 
-    def test_create_recipe_too_many_ingredients(self, client: TestClient):
-        """Test recipe creation with too many ingredients"""
-        ingredients = [
-            {"name": f"ingredient_{i}", "amount": "1", "unit": "cup", "notes": None}
-            for i in range(51)  # More than 50 ingredients
-        ]
+        data = response_json(response)
+        assert [recipe["title"] for recipe in data] == [r["title"] for r in recipes]
+        assert all("id" in recipe and "created_at" in recipe for recipe in data)
+        assert len({recipe["id"] for recipe in data}) == 5
 
-        recipe_data = {
-            "title": "Recipe With Too Many Ingredients",
-            "instructions": "Cook everything together properly.",
-            "ingredients": ingredients
-        }
+        list_response = client.get("/api/recipes?page_size=10")
+        assert response_json(list_response)["total"] == 5
 
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 422
+    def test_create_recipes_bulk_invalid_item(
+        self, post_json, client: TestClient, sample_recipe_data
+    ):
+        """Test bulk creation fails as a whole when one recipe is invalid"""
+        recipes = [sample_recipe_data, {**sample_recipe_data, "title": ""}]
 
-    def test_create_recipe_large_payload(self, client: TestClient):
-        """Test recipe creation with maximum allowed payload"""
-        ingredients = [
-            {"name": f"ingredient_{i}", "amount": "1", "unit": "cup", "notes": "notes"}
-            for i in range(50)  # Maximum ingredients
-        ]
+        response = post_json("/api/recipes/bulk", recipes)
+        assert_status(response, 422)
 
-        recipe_data = {
-            "title": "A" * 200,  # Maximum title length
-            "description": "B" * 1000,  # Large description
-            "instructions": "C" * 5000,  # Large instructions
-            "ingredients": ingredients,
-            "prep_time": 600,  # Maximum prep time
-            "cook_time": 1440,  # Maximum cook time
-            "servings": 20,  # Maximum servings
-            "difficulty": "Expert"
-        }
+        list_response = client.get("/api/recipes")
+        assert response_json(list_response)["total"] == 0
 
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 200
+    def test_create_recipes_bulk_too_many(self, post_json, sample_recipe_data):
+        """Test bulk creation rejects more recipes than the per-request limit"""
+        response = post_json("/api/recipes/bulk", [sample_recipe_data] * 101)
+        assert_status(response, 422)
 
     def test_get_recipes_pagination(self, client: TestClient):
         """Test recipe retrieval with pagination"""
         response = client.get("/api/recipes?page=1&page_size=5")
-        assert response.status_code == 200
-
-        data = response.json()
-        assert "items" in data
-        assert "total" in data
-        assert "page" in data
-        assert "pages" in data
-        assert "per_page" in data
-        assert "has_next" in data
-        assert "has_prev" in data
-
-    def test_get_recipes_invalid_pagination(self, client: TestClient):
-        """Test recipe retrieval with invalid pagination parameters"""
-        # Invalid page number
-        response = client.get("/api/recipes?page=0")
-        assert response.status_code == 422
+        assert_status(response, 200)
+
+        data = response_json(response)
+        assert PAGINATION_KEYS <= data.keys(), PAGINATION_KEYS - data.keys()
 
-        # Invalid page size
-        response = client.get("/api/recipes?page_size=200")
-        assert response.status_code == 422
+    @pytest.mark.asyncio
+    async def test_get_recipes_invalid_pagination(self, async_client):
+        """Test recipe retrieval with invalid pagination parameters"""
+        responses = await asyncio.gather(
+            async_client.get("/api/recipes?page=0"),  # Invalid page number
+            async_client.get("/api/recipes?page_size=200"),  # Invalid page size
+        )
+        assert [response.status_code for response in responses] == [422, 422]
 
-    def test_get_recipe_by_id_success(self, client: TestClient, sample_recipe_data):
+    def test_get_recipe_by_id_success(self, client: TestClient, created_recipe):
         """Test successful recipe retrieval by ID"""
-        # First create a recipe
-        create_response = client.post("/api/recipes", json=sample_recipe_data)
-        assert create_response.status_code == 200
-        recipe_id = create_response.json()["id"]
+        recipe_id = created_recipe["id"]
 
         # Then retrieve it
         response = client.get(f"/api/recipes/{recipe_id}")
-        assert response.status_code == 200
+        assert_status(response, 200)
 
-        data = response.json()
+        data = response_json(response)
         assert data["id"] == recipe_id
-        assert data["title"] == sample_recipe_data["title"]
+        assert data["title"] == created_recipe["title"]
 
     def test_get_recipe_by_id_not_found(self, client: TestClient):
         """Test recipe retrieval with non-existent ID"""
         response = client.get("/api/recipes/99999")
-        assert response.status_code == 404
+        assert_status(response, 404)
 
     def test_get_recipe_by_id_invalid_id(self, client: TestClient):
         """Test recipe retrieval with invalid ID format"""
         response = client.get("/api/recipes/invalid")
-        assert response.status_code == 422
+        assert_status(response, 422)
 
-    def test_delete_recipe_success(self, client: TestClient, sample_recipe_data):
+    def test_delete_recipe_success(
+        self, client: TestClient, db_session, created_recipe
+    ):
         """Test successful recipe deletion"""
-        # First create a recipe
-        create_response = client.post("/api/recipes", json=sample_recipe_data)
-        assert create_response.status_code == 200
-        recipe_id = create_response.json()["id"]
+        recipe_id = created_recipe["id"]
 
-        # Then delete it
         response = client.delete(f"/api/recipes/{recipe_id}")
-        assert response.status_code == 200
+        assert_status(response, 200)
 
-        # Verify it's deleted
-        get_response = client.get(f"/api/recipes/{recipe_id}")
-        assert get_response.status_code == 404
+        # Verify it's deleted, straight from the database
+        assert db_session.get(Recipe, recipe_id) is None
 
     def test_delete_recipe_not_found(self, client: TestClient):
         """Test recipe deletion with non-existent ID"""
         response = client.delete("/api/recipes/99999")
-        assert response.status_code == 404
+        assert_status(response, 404)
 
-    def test_rate_recipe_success(self, client: TestClient, sample_recipe_data):
+    def test_rate_recipe_success(self, client: TestClient, created_recipe):
         """Test successful recipe rating"""
-        # First create a recipe
-        create_response = client.post("/api/recipes", json=sample_recipe_data)
-        assert create_response.status_code == 200
-        recipe_id = create_response.json()["id"]
+        recipe_id = created_recipe["id"]
 
         # Then rate it
         response = client.put(f"/api/recipes/{recipe_id}/rating?rating=4.5")
-        assert response.status_code == 200
+        assert_status(response, 200)
 
-        data = response.json()
+        data = response_json(response)
         assert data["rating"] == 4.5
 
-    def test_rate_recipe_invalid_rating(self, client: TestClient, sample_recipe_data):
+    @pytest.mark.asyncio
+    async def test_rate_recipe_invalid_rating(self, async_client, created_recipe):
         """Test recipe rating with invalid rating values"""
-        # First create a recipe
-        create_response = client.post("/api/recipes", json=sample_recipe_data)
-        assert create_response.status_code == 200
-        recipe_id = create_response.json()["id"]
-
-        # Test rating too low
-        response = client.put(f"/api/recipes/{recipe_id}/rating?rating=0.5")
-        assert response.status_code == 422
-
-        # Test rating too high
-        response = client.put(f"/api/recipes/{recipe_id}/rating?rating=5.5")
-        assert response.status_code == 422
-
-    def test_search_recipes_by_query(self, client: TestClient):
-        """Test recipe search with query parameter"""
-        response = client.get("/api/recipes/search?q=pasta")
-        assert response.status_code == 200
-
-        data = response.json()
-        assert "items" in data
-        assert "total" in data
-
-    def test_search_recipes_by_difficulty(self, client: TestClient):
-        """Test recipe search by difficulty"""
-        response = client.get("/api/recipes/search?difficulty=Easy")
-        assert response.status_code == 200
-
-    def test_search_recipes_by_rating(self, client: TestClient):
-        """Test recipe search by minimum rating"""
-        response = client.get("/api/recipes/search?min_rating=4.0")
-        assert response.status_code == 200
-
-    def test_search_recipes_by_time_constraints(self, client: TestClient):
-        """Test recipe search by time constraints"""
-        response = client.get("/api/recipes/search?max_prep_time=30&max_cook_time=60")
-        assert response.status_code == 200
-
-    def test_search_recipes_invalid_parameters(self, client: TestClient):
-        """Test recipe search with invalid parameters"""
-        # Invalid difficulty
-        response = client.get("/api/recipes/search?difficulty=Impossible")
-        assert response.status_code == 422
-
-        # Invalid rating range
-        response = client.get("/api/recipes/search?min_rating=6.0")
-        assert response.status_code == 422
+        recipe_id = created_recipe["id"]
+
+        responses = await asyncio.gather(
+            # Rating too low
+            async_client.put(f"/api/recipes/{recipe_id}/rating?rating=0.5"),
+            # Rating too high
+            async_client.put(f"/api/recipes/{recipe_id}/rating?rating=5.5"),
+        )
+        assert [response.status_code for response in responses] == [422, 422]
+
+    @pytest.mark.asyncio
+    async def test_search_recipes_happy_paths(self, async_client, bulk_insert_recipes):
+        """Test recipe search by query, difficulty, rating and time constraints"""
+        recipe_ids = bulk_insert_recipes(
+            [
+                {
+                    "title": title,
+                    "description": None,
+                    "instructions": "Cook everything together properly.",
+                    "ingredients": VALID_INGREDIENTS,
+                    "difficulty": difficulty,
+                    "rating": rating,
+                    "prep_time": prep_time,
+                    "cook_time": cook_time,
+                }
+                for title, difficulty, rating, prep_time, cook_time in SEARCH_RECIPES
+            ]
+        )
 
-        # Invalid time values
-        response = client.get("/api/recipes/search?max_prep_time=-5")
-        assert response.status_code == 422
+        responses = await asyncio.gather(
+            *[
+                async_client.get(f"/api/recipes/search?{query}")
+                for query in SEARCH_CASES
+            ]
+        )
+        for (query, expected), response in zip(SEARCH_CASES.items(), responses):
+            assert_status(response, 200)
+
+            data = response_json(response)
+            assert sorted(recipe["id"] for recipe in data["items"]) == [
+                recipe_ids[i] for i in expected
+            ], query
+            assert data["total"] == len(expected), query
+
+    @pytest.mark.asyncio
+    async def test_search_recipes_invalid_parameters(self, async_client):
+        """Test recipe search with invalid parameters"""
+        responses = await asyncio.gather(
+            # Invalid difficulty
+            async_client.get("/api/recipes/search?difficulty=Impossible"),
+            # Invalid rating range
+            async_client.get("/api/recipes/search?min_rating=6.0"),
+            # Invalid time values
+            async_client.get("/api/recipes/search?max_prep_time=-5"),
+        )
+        assert [response.status_code for response in responses] == [422, 422, 422]
 
     def test_get_stats_endpoint(self, client: TestClient):
         """Test the statistics endpoint"""
         response = client.get("/api/stats")
-        assert response.status_code == 200
+        assert_status(response, 200)
 
-        data = response.json()
+        data = response_json(response)
         assert "total_recipes" in data
         assert "average_rating" in data
         assert isinstance(data["total_recipes"], int)
-        assert isinstance(data["average_rating"], (int, float))
+        assert isinstance(data["average_rating"], Real)
@@ -5,16 +5,39 @@ Tests for recipe API endpoints
 import pytest
 from fastapi.testclient import TestClient
 
+from app.models import Recipe
+from helpers import assert_status, response_json
+
+# Recipe with every field at its maximum, built once at import
+LARGE_RECIPE = {
+    "title": "A" * 200,  # Max length
+    "description": "B" * 1000,  # Max length
+    "instructions": "C" * 5000,  # Large instructions
+    "ingredients": [
+        {
+            "name": f"ingredient_{i}",
+            "amount": str(i),
+            "unit": "cup",
+            "notes": f"notes_{i}",
+        }
+        for i in range(50)  # Max ingredients
+    ],
+    "prep_time": 600,  # Max prep time
+    "cook_time": 1440,  # Max cook time
+    "servings": 20,  # Max servings
+    "difficulty": "Expert",
+}
+
 
 class TestRecipeAPI:
     """Test cases for recipe CRUD operations"""
 
-    def test_create_recipe_success(self, client: TestClient, sample_recipe_data):
+    def test_create_recipe_success(self, post_json, sample_recipe_data):
         """Test successful recipe creation"""
-        response = client.post("/api/recipes", json=sample_recipe_data)
+        response = post_json("/api/recipes", sample_recipe_data)
 
-        assert response.status_code == 200
-        data = response.json()
+        assert_status(response, 200)
+        data = response_json(response)
 
         # Check response structure
         assert "id" in data
@@ -30,7 +53,7 @@ class TestRecipeAPI:
         assert "updated_at" in data
         assert data["rating"] is None
 
-    def test_create_recipe_validation_errors(self, client: TestClient):
+    def test_create_recipe_validation_errors(self, post_json):
         """Test recipe creation with validation errors"""
         # Test missing title
         invalid_data = {
@@ -39,8 +62,8 @@ class TestRecipeAPI:
             "ingredients": [{"name": "test", "amount": "1", "unit": "cup"}],
         }
 
-        response = client.post("/api/recipes", json=invalid_data)
-        assert response.status_code == 422
+        response = post_json("/api/recipes", invalid_data)
+        assert_status(response, 422)
 
         # Test empty ingredients
         invalid_data_empty_ingredients = {
@@ -50,36 +73,32 @@ class TestRecipeAPI:
             "ingredients": [],
         }
 
-        response = client.post("/api/recipes", json=invalid_data_empty_ingredients)
-        assert response.status_code == 422
+        response = post_json("/api/recipes", invalid_data_empty_ingredients)
+        assert_status(response, 422)
 
-    def test_create_recipe_invalid_difficulty(
-        self, client: TestClient, sample_recipe_data
-    ):
+    def test_create_recipe_invalid_difficulty(self, post_json, sample_recipe_data):
         """Test recipe creation with invalid difficulty"""
         sample_recipe_data["difficulty"] = "Invalid"
 
-        response = client.post("/api/recipes", json=sample_recipe_data)
-        assert response.status_code == 422
+        response = post_json("/api/recipes", sample_recipe_data)
+        assert_status(response, 422)
 
-        error_data = response.json()
+        error_data = response_json(response)
         assert "detail" in error_data
         assert "Difficulty must be one of" in str(error_data["detail"])
 
     def test_create_recipe_invalid_ingredient_format(
-        self, client: TestClient, sample_recipe_data
+        self, post_json, sample_recipe_data
     ):
         """Test recipe creation with invalid ingredient format"""
         sample_recipe_data["ingredients"] = [
             {"name": "", "amount": "1", "unit": "cup"}  # Empty name
         ]
 
-        response = client.post("/api/recipes", json=sample_recipe_data)
-        assert response.status_code == 422
+        response = post_json("/api/recipes", sample_recipe_data)
+        assert_status(response, 422)
 
-    def test_create_recipe_unicode_ingredients(
-        self, client: TestClient, sample_recipe_data
-    ):
+    def test_create_recipe_unicode_ingredients(self, post_json, sample_recipe_data):
         """Test recipe creation with unicode characters"""
         sample_recipe_data["ingredients"] = [
             {
@@ -97,10 +116,10 @@ class TestRecipeAPI:
             {"name": "Naïve herbs", "amount": "1", "unit": "tbsp", "notes": "mixed"},
         ]
 
-        response = client.post("/api/recipes", json=sample_recipe_data)
-        assert response.status_code == 200
+        response = post_json("/api/recipes", sample_recipe_data)
+        assert_status(response, 200)
 
-        data = response.json()
+        data = response_json(response)
         assert len(data["ingredients"]) == 3
         assert data["ingredients"][0]["name"] == "Jalapeño peppers"
 
@@ -109,44 +128,45 @@ class TestRecipeAPI:
         recipe_id = created_recipe["id"]
 
         response = client.get(f"/api/recipes/{recipe_id}")
-        assert response.status_code == 200
+        assert_status(response, 200)
 
-        data = response.json()
+        data = response_json(response)
         assert data["id"] == recipe_id
         assert data["title"] == created_recipe["title"]
 
     def test_get_recipe_not_found(self, client: TestClient):
         """Test 404 for non-existent recipe"""
         response = client.get("/api/recipes/99999")
-        assert response.status_code == 404
+        assert_status(response, 404)
 
-        error_data = response.json()
+        error_data = response_json(response)
         assert "detail" in error_data
         assert "Recipe not found" in error_data["detail"]
 
     def test_get_recipe_invalid_id(self, client: TestClient):
         """Test invalid recipe ID format"""
         response = client.get("/api/recipes/invalid")
-        assert response.status_code == 422
+        assert_status(response, 422)
 
-    def test_delete_recipe_success(self, client: TestClient, created_recipe):
+    def test_delete_recipe_success(
+        self, client: TestClient, db_session, created_recipe
+    ):
         """Test successful recipe deletion"""
         recipe_id = created_recipe["id"]
 
         # Delete the recipe
         response = client.delete(f"/api/recipes/{recipe_id}")
-        assert response.status_code == 200
+        assert_status(response, 200)
 
-        # Verify it's deleted
-        response = client.get(f"/api/recipes/{recipe_id}")
-        assert response.status_code == 404
+        # Verify it's deleted, straight from the database
+        assert db_session.get(Recipe, recipe_id) is None
 
     def test_delete_recipe_not_found(self, client: TestClient):
         """Test 404 for deleting non-existent recipe"""
         response = client.delete("/api/recipes/99999")
-        assert response.status_code == 404
+        assert_status(response, 404)
 
-        error_data = response.json()
+        error_data = response_json(response)
         assert "detail" in error_data
         assert "Recipe not found" in error_data["detail"]
 
@@ -158,15 +178,15 @@ class TestRecipeAPI:
         response = client.put(
             f"/api/recipes/{recipe_id}/rating", params={"rating": 4.5}
         )
-        assert response.status_code == 200
+        assert_status(response, 200)
 
-        data = response.json()
+        data = response_json(response)
         assert data["rating"] == 4.5
 
         # Verify rating is saved
         response = client.get(f"/api/recipes/{recipe_id}")
-        assert response.status_code == 200
-        data = response.json()
+        assert_status(response, 200)
+        data = response_json(response)
         assert data["rating"] == 4.5
 
     def test_rate_recipe_invalid_rating(self, client: TestClient, created_recipe):
@@ -177,39 +197,20 @@ class TestRecipeAPI:
         response = client.put(
             f"/api/recipes/{recipe_id}/rating", params={"rating": 6.0}
         )
-        assert response.status_code == 422
+        assert_status(response, 422)
 
         # Test rating too low
         response = client.put(
             f"/api/recipes/{recipe_id}/rating", params={"rating": -1.0}
         )
-        assert response.status_code == 422
+        assert_status(response, 422)
 
-    def test_create_recipe_large_payload(self, client: TestClient):
+    def test_create_recipe_large_payload(self, post_json):
         """Test creating recipe with large payload"""
-        large_recipe = {
-            "title": "A" * 200,  # Max length
-            "description": "B" * 1000,  # Max length
-            "instructions": "C" * 5000,  # Large instructions
-            "ingredients": [
-                {
-                    "name": f"ingredient_{i}",
-                    "amount": str(i),
-                    "unit": "cup",
-                    "notes": f"notes_{i}",
-                }
-                for i in range(50)  # Max ingredients
-            ],
-            "prep_time": 600,  # Max prep time
-            "cook_time": 1440,  # Max cook time
-            "servings": 20,  # Max servings
-            "difficulty": "Expert",
-        }
-
-        response = client.post("/api/recipes", json=large_recipe)
-        assert response.status_code == 200
+        response = post_json("/api/recipes", LARGE_RECIPE)
+        assert_status(response, 200)
 
-        data = response.json()
+        data = response_json(response)
         assert len(data["ingredients"]) == 50
         assert data["prep_time"] == 600
         assert data["cook_time"] == 1440
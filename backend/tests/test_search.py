@@ -2,46 +2,191 @@
 Tests for search functionality
 """
 
+import orjson
 import pytest
-from fastapi.testclient import TestClient
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Search corpora, inserted straight into the database by the fixtures and tests below
+CHICKEN_RECIPES = (
+    {
+        "title": "Chicken Pasta",
+        "description": "Delicious chicken pasta",
+        "instructions": "Cook pasta",
+        "ingredients": [{"name": "chicken", "amount": "1", "unit": "lb"}],
+        "difficulty": "Easy",
+    },
+    {
+        "title": "Beef Stir Fry",
+        "description": "Quick beef stir fry",
+        "instructions": "Stir fry beef",
+        "ingredients": [{"name": "beef", "amount": "1", "unit": "lb"}],
+        "difficulty": "Medium",
+    },
+    {
+        "title": "Chicken Curry",
+        "description": "Spicy chicken curry",
+        "instructions": "Cook curry",
+        "ingredients": [{"name": "chicken", "amount": "2", "unit": "lb"}],
+        "difficulty": "Hard",
+    },
+)
+
+PASTA_RECIPES = (
+    {
+        "title": "Chicken Pasta Salad",
+        "description": "Cold pasta salad",
+        "instructions": "Mix ingredients",
+        "ingredients": [{"name": "chicken", "amount": "1", "unit": "lb"}],
+        "difficulty": "Easy",
+    },
+    {
+        "title": "Beef Pasta Bake",
+        "description": "Baked pasta dish",
+        "instructions": "Bake pasta",
+        "ingredients": [{"name": "beef", "amount": "1", "unit": "lb"}],
+        "difficulty": "Medium",
+    },
+    {
+        "title": "Vegetarian Pasta",
+        "description": "Simple pasta",
+        "instructions": "Cook pasta",
+        "ingredients": [{"name": "pasta", "amount": "200", "unit": "g"}],
+        "difficulty": "Easy",
+    },
+)
+
+TOMATO_RECIPES = (
+    {
+        "title": "Pasta with Tomatoes",
+        "description": "Simple pasta",
+        "instructions": "Cook pasta according to package directions",
+        "ingredients": [
+            {"name": "pasta", "amount": "200", "unit": "g"},
+            {"name": "tomatoes", "amount": "3", "unit": "pieces"},
+        ],
+        "difficulty": "Easy",
+    },
+    {
+        "title": "Tomato Soup",
+        "description": "Creamy soup",
+        "instructions": "Blend tomatoes with cream and seasonings",
+        "ingredients": [
+            {"name": "tomatoes", "amount": "500", "unit": "g"},
+            {"name": "cream", "amount": "100", "unit": "ml"},
+        ],
+        "difficulty": "Easy",
+    },
+    {
+        "title": "Beef Stew",
+        "description": "Hearty stew",
+        "instructions": "Stew beef with vegetables for hours",
+        "ingredients": [
+            {"name": "beef", "amount": "1", "unit": "lb"},
+            {"name": "potatoes", "amount": "3", "unit": "pieces"},
+        ],
+        "difficulty": "Medium",
+    },
+)
+
+SPICY_RECIPES = (
+    {
+        "title": "Recipe 1",
+        "description": "Delicious spicy meal",
+        "instructions": "Cook the spicy meal properly",
+        "ingredients": [{"name": "ingredient", "amount": "1", "unit": "cup"}],
+        "difficulty": "Easy",
+    },
+    {
+        "title": "Recipe 2",
+        "description": "Mild and sweet",
+        "instructions": "Cook the mild meal properly",
+        "ingredients": [{"name": "ingredient", "amount": "1", "unit": "cup"}],
+        "difficulty": "Easy",
+    },
+    {
+        "title": "Recipe 3",
+        "description": "Very spicy dish",
+        "instructions": "Cook the very spicy dish properly",
+        "ingredients": [{"name": "ingredient", "amount": "1", "unit": "cup"}],
+        "difficulty": "Easy",
+    },
+)
+
+# Twelve recipes with "pasta" in the title, enough for three pages of five
+PAGED_PASTA_RECIPES = tuple(
+    {
+        "title": f"Pasta Recipe {i}",
+        "description": f"Pasta recipe number {i}",
+        "instructions": f"Cook pasta {i}",
+        "ingredients": [{"name": "pasta", "amount": "200", "unit": "g"}],
+        "difficulty": "Easy",
+    }
+    for i in range(12)
+)
+
+# Only its ingredient names mention jalapeño; none of its text contains
+# the JSON keys of an ingredient
+STUFFED_PEPPERS_RECIPE = {
+    "title": "Stuffed Peppers",
+    "description": "Cheesy baked peppers",
+    "instructions": "Stuff and bake",
+    "ingredients": [
+        {"name": "Jalapeño", "amount": "6", "unit": "pieces", "notes": None}
+    ],
+    "difficulty": "Easy",
+}
+
+
+@pytest.fixture
+def chicken_corpus(bulk_insert_recipes):
+    """Insert the chicken search corpus directly, without the API"""
+    return bulk_insert_recipes(CHICKEN_RECIPES)
+
+
+@pytest.fixture
+def pasta_corpus(bulk_insert_recipes):
+    """Insert the pasta search corpus directly, without the API"""
+    return bulk_insert_recipes(PASTA_RECIPES)
+
+
+@pytest.fixture
+def tomato_corpus(bulk_insert_recipes):
+    """Insert the tomato search corpus directly, without the API"""
+    return bulk_insert_recipes(TOMATO_RECIPES)
 
 
 class TestSearch:
     """Test cases for recipe search functionality"""
 
-    def test_search_recipes_by_title(self, client: TestClient):
-        """Test searching recipes by title"""
-        # Create test recipes
-        recipes = [
-            {
-                "title": "Chicken Pasta",
-                "description": "Delicious chicken pasta",
-                "instructions": "Cook pasta",
-                "ingredients": [{"name": "chicken", "amount": "1", "unit": "lb"}],
-                "difficulty": "Easy",
-            },
-            {
-                "title": "Beef Stir Fry",
-                "description": "Quick beef stir fry",
-                "instructions": "Stir fry beef",
-                "ingredients": [{"name": "beef", "amount": "1", "unit": "lb"}],
-                "difficulty": "Medium",
-            },
-            {
-                "title": "Chicken Curry",
-                "description": "Spicy chicken curry",
-                "instructions": "Cook curry",
-                "ingredients": [{"name": "chicken", "amount": "2", "unit": "lb"}],
-                "difficulty": "Hard",
-            },
-        ]
-
-        for recipe in recipes:
-            response = client.post("/api/recipes", json=recipe)
-            assert response.status_code == 200
+    @pytest.mark.asyncio
+    async def test_search_recipe_created_via_api(
+        self, async_client, sample_recipe_data
+    ):
+        """Test a recipe created through the API is found by search"""
+        response = await async_client.post(
+            "/api/recipes",
+            content=orjson.dumps(sample_recipe_data),
+            headers=JSON_HEADERS,
+        )
+        assert response.status_code == 200
+        recipe_id = response.json()["id"]
+
+        response = await async_client.get(
+            "/api/recipes/search", params={"q": "chicken"}
+        )
+        assert response.status_code == 200
 
+        data = response.json()
+        assert [recipe["id"] for recipe in data["items"]] == [recipe_id]
+
+    @pytest.mark.asyncio
+    async def test_search_recipes_by_title(self, async_client, chicken_corpus):
+        """Test searching recipes by title"""
         # Search for "chicken"
-        response = client.get("/api/recipes/search", params={"q": "chicken"})
+        response = await async_client.get(
+            "/api/recipes/search", params={"q": "chicken"}
+        )
         assert response.status_code == 200
 
         data = response.json()
@@ -52,39 +197,15 @@ class TestSearch:
         for recipe in data["items"]:
             assert "chicken" in recipe["title"].lower()
 
-    def test_search_recipes_by_description(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_search_recipes_by_description(
+        self, async_client, bulk_insert_recipes
+    ):
         """Test searching recipes by description"""
-        # Create test recipes
-        recipes = [
-            {
-                "title": "Recipe 1",
-                "description": "Delicious spicy meal",
-                "instructions": "Cook the spicy meal properly",
-                "ingredients": [{"name": "ingredient", "amount": "1", "unit": "cup"}],
-                "difficulty": "Easy",
-            },
-            {
-                "title": "Recipe 2",
-                "description": "Mild and sweet",
-                "instructions": "Cook the mild meal properly",
-                "ingredients": [{"name": "ingredient", "amount": "1", "unit": "cup"}],
-                "difficulty": "Easy",
-            },
-            {
-                "title": "Recipe 3",
-                "description": "Very spicy dish",
-                "instructions": "Cook the very spicy dish properly",
-                "ingredients": [{"name": "ingredient", "amount": "1", "unit": "cup"}],
-                "difficulty": "Easy",
-            },
-        ]
-
-        for recipe in recipes:
-            response = client.post("/api/recipes", json=recipe)
-            assert response.status_code == 200
+        bulk_insert_recipes(SPICY_RECIPES)
 
         # Search for "spicy"
-        response = client.get("/api/recipes/search", params={"q": "spicy"})
+        response = await async_client.get("/api/recipes/search", params={"q": "spicy"})
         assert response.status_code == 200
 
         data = response.json()
@@ -94,48 +215,13 @@ class TestSearch:
         for recipe in data["items"]:
             assert "spicy" in recipe["description"].lower()
 
-    def test_search_recipes_by_ingredients(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_search_recipes_by_ingredients(self, async_client, tomato_corpus):
         """Test searching recipes by ingredients"""
-        # Create test recipes
-        recipes = [
-            {
-                "title": "Pasta with Tomatoes",
-                "description": "Simple pasta",
-                "instructions": "Cook pasta according to package directions",
-                "ingredients": [
-                    {"name": "pasta", "amount": "200", "unit": "g"},
-                    {"name": "tomatoes", "amount": "3", "unit": "pieces"},
-                ],
-                "difficulty": "Easy",
-            },
-            {
-                "title": "Tomato Soup",
-                "description": "Creamy soup",
-                "instructions": "Blend tomatoes with cream and seasonings",
-                "ingredients": [
-                    {"name": "tomatoes", "amount": "500", "unit": "g"},
-                    {"name": "cream", "amount": "100", "unit": "ml"},
-                ],
-                "difficulty": "Easy",
-            },
-            {
-                "title": "Beef Stew",
-                "description": "Hearty stew",
-                "instructions": "Stew beef with vegetables for hours",
-                "ingredients": [
-                    {"name": "beef", "amount": "1", "unit": "lb"},
-                    {"name": "potatoes", "amount": "3", "unit": "pieces"},
-                ],
-                "difficulty": "Medium",
-            },
-        ]
-
-        for recipe in recipes:
-            response = client.post("/api/recipes", json=recipe)
-            assert response.status_code == 200
-
         # Search for "tomatoes"
-        response = client.get("/api/recipes/search", params={"q": "tomatoes"})
+        response = await async_client.get(
+            "/api/recipes/search", params={"q": "tomatoes"}
+        )
         assert response.status_code == 200
 
         data = response.json()
@@ -149,34 +235,72 @@ class TestSearch:
             )
             assert has_tomatoes
 
-    def test_search_recipes_case_insensitive(self, client: TestClient):
-        """Test case-insensitive search"""
-        # Create test recipe
-        recipe_data = {
-            "title": "Chicken Pasta",
-            "description": "Delicious pasta with chicken",
-            "instructions": "Cook pasta and chicken",
-            "ingredients": [{"name": "chicken", "amount": "1", "unit": "lb"}],
-            "difficulty": "Easy",
-        }
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("term", ["name", "amount", "unit", "notes", "null"])
+    async def test_search_recipes_ignores_ingredient_json_keys(
+        self, async_client, bulk_insert_recipes, term
+    ):
+        """Test JSON keys and literals of the ingredients never match"""
+        bulk_insert_recipes([STUFFED_PEPPERS_RECIPE])
 
-        response = client.post("/api/recipes", json=recipe_data)
+        response = await async_client.get("/api/recipes/search", params={"q": term})
         assert response.status_code == 200
 
-        # Test different cases
-        search_terms = ["chicken", "CHICKEN", "Chicken", "ChIcKeN"]
+        data = response.json()
+        assert data["items"] == []
+        assert data["total"] == 0
 
-        for term in search_terms:
-            response = client.get("/api/recipes/search", params={"q": term})
-            assert response.status_code == 200
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("term", ["jalapeño", "Jalapeño", "lapeñ"])
+    async def test_search_recipes_by_non_ascii_ingredient(
+        self, async_client, bulk_insert_recipes, term
+    ):
+        """Test non-ASCII ingredient names match the text as written"""
+        (recipe_id,) = bulk_insert_recipes([STUFFED_PEPPERS_RECIPE])
 
-            data = response.json()
-            assert len(data["items"]) == 1
-            assert data["items"][0]["title"] == "Chicken Pasta"
+        response = await async_client.get("/api/recipes/search", params={"q": term})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert [recipe["id"] for recipe in data["items"]] == [recipe_id]
+
+    @pytest.mark.asyncio
+    async def test_search_recipes_all_words_required(
+        self, async_client, chicken_corpus
+    ):
+        """Test every word of a term must match, in any searchable field"""
+        # "chicken" is in both chicken titles, "spicy" only in the curry's description
+        response = await async_client.get(
+            "/api/recipes/search", params={"q": "spicy chicken"}
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert [recipe["title"] for recipe in data["items"]] == ["Chicken Curry"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("term", ["chicken", "CHICKEN", "Chicken", "ChIcKeN"])
+    async def test_search_recipes_case_insensitive(
+        self, async_client, chicken_corpus, term
+    ):
+        """Test case-insensitive search"""
+        response = await async_client.get("/api/recipes/search", params={"q": term})
+        assert response.status_code == 200
 
-    def test_search_recipes_partial_match(self, client: TestClient):
+        data = response.json()
+        assert len(data["items"]) == 2
+        assert {recipe["title"] for recipe in data["items"]} == {
+            "Chicken Pasta",
+            "Chicken Curry",
+        }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("term", ["spag", "bologn", "ital"])
+    async def test_search_recipes_partial_match(
+        self, async_client, bulk_insert_recipes, term
+    ):
         """Test partial word matching in search"""
-        # Create test recipe
+        # Insert test recipe
         recipe_data = {
             "title": "Spaghetti Bolognese",
             "description": "Traditional Italian pasta",
@@ -185,36 +309,23 @@ class TestSearch:
             "difficulty": "Medium",
         }
 
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 200
-
-        # Search for partial matches
-        partial_terms = ["spag", "bologna", "ital"]
+        bulk_insert_recipes([recipe_data])
 
-        for term in partial_terms:
-            response = client.get("/api/recipes/search", params={"q": term})
-            assert response.status_code == 200
+        response = await async_client.get("/api/recipes/search", params={"q": term})
+        assert response.status_code == 200
 
-            data = response.json()
-            assert len(data["items"]) == 1
+        data = response.json()
+        assert len(data["items"]) == 1
 
-    def test_search_recipes_with_pagination(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_search_recipes_with_pagination(
+        self, async_client, bulk_insert_recipes
+    ):
         """Test search results with pagination"""
-        # Create multiple recipes with "pasta" in title
-        for i in range(12):
-            recipe_data = {
-                "title": f"Pasta Recipe {i}",
-                "description": f"Pasta recipe number {i}",
-                "instructions": f"Cook pasta {i}",
-                "ingredients": [{"name": "pasta", "amount": "200", "unit": "g"}],
-                "difficulty": "Easy",
-            }
-
-            response = client.post("/api/recipes", json=recipe_data)
-            assert response.status_code == 200
+        bulk_insert_recipes(PAGED_PASTA_RECIPES)
 
         # Search with pagination
-        response = client.get(
+        response = await async_client.get(
             "/api/recipes/search", params={"q": "pasta", "page": 1, "page_size": 5}
         )
         assert response.status_code == 200
@@ -227,7 +338,7 @@ class TestSearch:
         assert data["has_prev"] == False
 
         # Test second page
-        response = client.get(
+        response = await async_client.get(
             "/api/recipes/search", params={"q": "pasta", "page": 2, "page_size": 5}
         )
         assert response.status_code == 200
@@ -238,9 +349,32 @@ class TestSearch:
         assert data["has_next"] == True
         assert data["has_prev"] == True
 
-    def test_search_recipes_no_results(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_search_recipes_with_cursor(self, async_client, bulk_insert_recipes):
+        """Test walking search results with the keyset cursor"""
+        recipe_ids = bulk_insert_recipes(PAGED_PASTA_RECIPES)
+
+        seen_ids = []
+        cursor = 0
+        while cursor is not None:
+            response = await async_client.get(
+                "/api/recipes/search",
+                params={"q": "pasta", "cursor": cursor, "page_size": 5},
+            )
+            assert response.status_code == 200
+
+            data = response.json()
+            assert data["total"] == 12
+            assert data["has_prev"] == (cursor > 0)
+            seen_ids.extend(recipe["id"] for recipe in data["items"])
+            cursor = data["next_cursor"]
+
+        assert seen_ids == recipe_ids
+
+    @pytest.mark.asyncio
+    async def test_search_recipes_no_results(self, async_client, bulk_insert_recipes):
         """Test search with no matching results"""
-        # Create a recipe
+        # Insert a recipe
         recipe_data = {
             "title": "Chicken Pasta",
             "description": "Delicious pasta",
@@ -249,11 +383,12 @@ class TestSearch:
             "difficulty": "Easy",
         }
 
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 200
+        bulk_insert_recipes([recipe_data])
 
         # Search for non-existent term
-        response = client.get("/api/recipes/search", params={"q": "nonexistent"})
+        response = await async_client.get(
+            "/api/recipes/search", params={"q": "nonexistent"}
+        )
         assert response.status_code == 200
 
         data = response.json()
@@ -261,14 +396,18 @@ class TestSearch:
         assert data["total"] == 0
         assert data["pages"] == 0
 
-    def test_search_recipes_empty_query(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_search_recipes_empty_query(self, async_client):
         """Test search with empty query"""
-        response = client.get("/api/recipes/search", params={"q": ""})
+        response = await async_client.get("/api/recipes/search", params={"q": ""})
         assert response.status_code == 422
 
-    def test_search_recipes_special_characters(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_search_recipes_special_characters(
+        self, async_client, bulk_insert_recipes
+    ):
         """Test search with special characters"""
-        # Create recipe with special characters
+        # Insert a recipe with special characters
         recipe_data = {
             "title": "Café au Lait Recipe",
             "description": "French coffee with naïve herbs",
@@ -277,50 +416,23 @@ class TestSearch:
             "difficulty": "Easy",
         }
 
-        response = client.post("/api/recipes", json=recipe_data)
-        assert response.status_code == 200
+        bulk_insert_recipes([recipe_data])
 
         # Search for special characters
-        response = client.get("/api/recipes/search", params={"q": "café"})
+        response = await async_client.get("/api/recipes/search", params={"q": "café"})
         assert response.status_code == 200
 
         data = response.json()
         assert len(data["items"]) == 1
         assert "café" in data["items"][0]["title"].lower()
 
-    def test_search_recipes_multiple_words(self, client: TestClient):
+    @pytest.mark.asyncio
+    async def test_search_recipes_multiple_words(self, async_client, pasta_corpus):
         """Test search with multiple words"""
-        # Create test recipes
-        recipes = [
-            {
-                "title": "Chicken Pasta Salad",
-                "description": "Cold pasta salad",
-                "instructions": "Mix ingredients",
-                "ingredients": [{"name": "chicken", "amount": "1", "unit": "lb"}],
-                "difficulty": "Easy",
-            },
-            {
-                "title": "Beef Pasta Bake",
-                "description": "Baked pasta dish",
-                "instructions": "Bake pasta",
-                "ingredients": [{"name": "beef", "amount": "1", "unit": "lb"}],
-                "difficulty": "Medium",
-            },
-            {
-                "title": "Vegetarian Pasta",
-                "description": "Simple pasta",
-                "instructions": "Cook pasta",
-                "ingredients": [{"name": "pasta", "amount": "200", "unit": "g"}],
-                "difficulty": "Easy",
-            },
-        ]
-
-        for recipe in recipes:
-            response = client.post("/api/recipes", json=recipe)
-            assert response.status_code == 200
-
         # Search for multiple words
-        response = client.get("/api/recipes/search", params={"q": "pasta salad"})
+        response = await async_client.get(
+            "/api/recipes/search", params={"q": "pasta salad"}
+        )
         assert response.status_code == 200
 
         data = response.json()
@@ -109,7 +109,7 @@ class TestRecipeSchema:
             "difficulty": "Easy",
         }
 
-        recipe = RecipeCreate(**recipe_data)
+        recipe = RecipeCreate.model_validate(recipe_data)
 
         assert recipe.title == "Test Recipe"
         assert recipe.description == "A test recipe"
@@ -127,7 +127,7 @@ class TestRecipeSchema:
             "ingredients": [{"name": "food", "amount": "1", "unit": "piece"}],
         }
 
-        recipe = RecipeCreate(**recipe_data)
+        recipe = RecipeCreate.model_validate(recipe_data)
 
         assert recipe.title == "Minimal Recipe"
         assert recipe.description is None
@@ -144,7 +144,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "title" in str(exc_info.value)
 
@@ -157,7 +157,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "String should have at least 3 characters" in str(exc_info.value)
 
@@ -170,7 +170,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "at least 3 characters" in str(exc_info.value)
 
@@ -182,7 +182,7 @@ class TestRecipeSchema:
             "ingredients": [{"name": "food", "amount": "1", "unit": "piece"}],
         }
 
-        recipe = RecipeCreate(**recipe_data)
+        recipe = RecipeCreate.model_validate(recipe_data)
         assert len(recipe.title) == 200
 
     def test_recipe_too_long_title(self):
@@ -194,7 +194,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "200" in str(exc_info.value)
 
@@ -207,7 +207,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "at least 1 item" in str(exc_info.value)
 
@@ -223,7 +223,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "50" in str(exc_info.value)
 
@@ -237,24 +237,22 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "Difficulty must be one of" in str(exc_info.value)
 
-    def test_recipe_valid_difficulties(self):
-        """Test recipe with all valid difficulties"""
-        valid_difficulties = ["Easy", "Medium", "Hard", "Expert"]
-
-        for difficulty in valid_difficulties:
-            recipe_data = {
-                "title": "Test Recipe",
-                "instructions": "Cook the food.",
-                "ingredients": [{"name": "food", "amount": "1", "unit": "piece"}],
-                "difficulty": difficulty,
-            }
+    @pytest.mark.parametrize("difficulty", ["Easy", "Medium", "Hard", "Expert"])
+    def test_recipe_valid_difficulties(self, difficulty):
+        """Test recipe with each valid difficulty"""
+        recipe_data = {
+            "title": "Test Recipe",
+            "instructions": "Cook the food.",
+            "ingredients": [{"name": "food", "amount": "1", "unit": "piece"}],
+            "difficulty": difficulty,
+        }
 
-            recipe = RecipeCreate(**recipe_data)
-            assert recipe.difficulty == difficulty
+        recipe = RecipeCreate.model_validate(recipe_data)
+        assert recipe.difficulty == difficulty
 
     def test_recipe_time_validation(self):
         """Test recipe time validation"""
@@ -267,7 +265,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "greater than or equal to 0" in str(exc_info.value)
 
@@ -280,7 +278,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data_long)
+            RecipeCreate.model_validate(recipe_data_long)
 
         assert "1440" in str(exc_info.value)
 
@@ -295,7 +293,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "greater than or equal to 1" in str(exc_info.value)
 
@@ -308,7 +306,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data_many)
+            RecipeCreate.model_validate(recipe_data_many)
 
         assert "20" in str(exc_info.value)
 
@@ -323,7 +321,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "24 hours" in str(exc_info.value)
 
@@ -337,7 +335,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data)
+            RecipeCreate.model_validate(recipe_data)
 
         assert "Instructions cannot be empty" in str(exc_info.value)
 
@@ -349,7 +347,7 @@ class TestRecipeSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            RecipeCreate(**recipe_data_short)
+            RecipeCreate.model_validate(recipe_data_short)
 
         assert "at least 10 characters" in str(exc_info.value)
 
@@ -372,7 +370,7 @@ class TestMealPlanSchema:
             },
         }
 
-        meal_plan = MealPlanCreate(**meal_plan_data)
+        meal_plan = MealPlanCreate.model_validate(meal_plan_data)
 
         assert meal_plan.name == "Test Plan"
         assert len(meal_plan.recipes) == 7
@@ -394,7 +392,7 @@ class TestMealPlanSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            MealPlanCreate(**meal_plan_data)
+            MealPlanCreate.model_validate(meal_plan_data)
 
         assert "name" in str(exc_info.value)
 
@@ -414,7 +412,7 @@ class TestMealPlanSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            MealPlanCreate(**meal_plan_data)
+            MealPlanCreate.model_validate(meal_plan_data)
 
         assert "at least 1 character" in str(exc_info.value)
 
@@ -434,7 +432,7 @@ class TestMealPlanSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            MealPlanCreate(**meal_plan_data)
+            MealPlanCreate.model_validate(meal_plan_data)
 
         assert "Invalid day name" in str(exc_info.value)
 
@@ -454,7 +452,7 @@ class TestMealPlanSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            MealPlanCreate(**meal_plan_data)
+            MealPlanCreate.model_validate(meal_plan_data)
 
         assert "All 7 days" in str(exc_info.value)
 
@@ -475,7 +473,7 @@ class TestMealPlanSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            MealPlanCreate(**meal_plan_data)
+            MealPlanCreate.model_validate(meal_plan_data)
 
         assert "positive integer" in str(exc_info.value)
 
@@ -494,6 +492,6 @@ class TestMealPlanSchema:
         }
 
         with pytest.raises(ValidationError) as exc_info:
-            MealPlanCreate(**meal_plan_data_zero)
+            MealPlanCreate.model_validate(meal_plan_data_zero)
 
         assert "positive integer" in str(exc_info.value)
@@ -1,7 +1,24 @@
 -- Initialize the database with required extensions and setup
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Lowercased ingredient names of a recipe, one per line; recipe search
+-- matches against this instead of the serialized ingredients JSON
+CREATE OR REPLACE FUNCTION recipe_ingredient_names(ingredients json)
+RETURNS text
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT lower(string_agg(ingredient ->> 'name', E'\n'))
+    FROM json_array_elements(ingredients) AS ingredient
+$$;
 
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_recipes_created_at ON recipes(created_at);
 CREATE INDEX IF NOT EXISTS idx_recipes_rating ON recipes(rating);
 CREATE INDEX IF NOT EXISTS idx_meal_plans_created_at ON meal_plans(created_at);
+
+-- Trigram indexes serving the case-insensitive substring filters of
+-- /api/recipes/search (lower(column) LIKE '%term%'), and of its
+-- ingredient name matches
+CREATE INDEX IF NOT EXISTS idx_recipes_title_trgm ON recipes USING gin (lower(title) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_recipes_description_trgm ON recipes USING gin (lower(description) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_recipes_ingredient_names_trgm ON recipes USING gin (recipe_ingredient_names(ingredients) gin_trgm_ops);
@@ -4,7 +4,37 @@ Debug script to test CloudFront API routing
 """
 
 import requests
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+except ImportError:  # orjson ships with the backend requirements, not with this script
+    orjson = None
+    import json
+
+
+def _format_json(content):
+    """Pretty-print a JSON response body, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(orjson.loads(content), option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(json.loads(content), indent=2)
+
+
+# Endpoints whose bodies can run to many KB; only a preview of them is read
+PREVIEWED_ENDPOINTS = {"/api/recipes"}
+PREVIEW_BYTES = 2048
+
+
+def _probe(url, preview):
+    """GET a URL; return the response and its body, or only the first
+    PREVIEW_BYTES of the body when ``preview`` is set"""
+    if not preview:
+        response = requests.get(url, timeout=10)
+        return response, response.content
+    # Stop after the first chunk; closing the response abandons the rest
+    with requests.get(url, timeout=10, stream=True) as response:
+        return response, next(response.iter_content(PREVIEW_BYTES), b"")
+
 
 def test_cloudfront_api():
     """Test API endpoints through CloudFront"""
@@ -21,28 +51,38 @@ def test_cloudfront_api():
     print("🧪 Testing API connectivity...")
     print("=" * 60)
     
-    for endpoint in endpoints:
-        print(f"\n🔍 Testing {endpoint}")
-        
-        # Test CloudFront
-        try:
-            response = requests.get(f"{cloudfront_url}{endpoint}", timeout=10)
-            print(f"✅ CloudFront: {response.status_code} - {response.reason}")
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    print(f"   Response: {json.dumps(data, indent=2)[:200]}...")
-                except:
-                    print(f"   Response: {response.text[:200]}...")
-        except Exception as e:
-            print(f"❌ CloudFront: Error - {str(e)}")
-        
-        # Test ALB directly
-        try:
-            response = requests.get(f"{alb_url}{endpoint}", timeout=10)
-            print(f"✅ ALB Direct: {response.status_code} - {response.reason}")
-        except Exception as e:
-            print(f"❌ ALB Direct: Error - {str(e)}")
+    hosts = [
+        ("CloudFront", cloudfront_url),
+        ("ALB Direct", alb_url),
+    ]
+
+    # The probes are independent, so they all run at once and each result
+    # is printed as soon as it arrives. Plain requests.get keeps every
+    # worker on its own connection; a shared Session is not thread-safe
+    with ThreadPoolExecutor(max_workers=len(hosts) * len(endpoints)) as executor:
+        probes = {
+            executor.submit(
+                _probe, f"{base_url}{endpoint}", endpoint in PREVIEWED_ENDPOINTS
+            ): (label, endpoint)
+            for endpoint in endpoints
+            for label, base_url in hosts
+        }
+
+        for probe in as_completed(probes):
+            label, endpoint = probes[probe]
+            print(f"\n🔍 {label} {endpoint}")
+            try:
+                response, body = probe.result()
+                print(f"✅ {label}: {response.status_code} - {response.reason}")
+                # The ALB probes only report their status code
+                if label == "CloudFront" and response.status_code == 200:
+                    try:
+                        print(f"   Response: {_format_json(body)[:200]}...")
+                    except:
+                        # A truncated preview is not valid JSON; show it raw
+                        print(f"   Response: {body.decode(errors='replace')[:200]}...")
+            except Exception as e:
+                print(f"❌ {label}: Error - {str(e)}")
     
     print("\n" + "=" * 60)
     print("🎯 Recommendations:")
@@ -20,7 +20,10 @@ Options:
     --pdf            Generate PDF report
     --html           Generate HTML dashboard
     --failures-only  Show only failed tests
-    --parallel       Run tests in parallel (faster)
+    --no-parallel    Run tests serially (parallel via pytest-xdist is the default)
+    --in-process     Run pytest in this interpreter (only with --quick)
+    --no-json-summary  Skip writing the JSON test summary
+    --prune N        Delete reports from all but the N most recent earlier runs
     --docker         Test against Docker containers
     --staging        Test against staging environment
     --verbose        Show detailed output
@@ -33,16 +36,37 @@ import subprocess
 import json
 import time
 import argparse
+import bisect
+import contextlib
+import heapq
+import html
+import importlib.util
+import io
+import re
+import threading
 from datetime import datetime
 from pathlib import Path
 import logging
 from typing import Dict, List, Optional, Tuple
-import statistics
+
+try:
+    import orjson
+except ImportError:  # orjson ships with the backend requirements, not with this script
+    orjson = None
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Packages whose import name isn't the distribution name with '_' for '-'
+IMPORT_NAMES = {
+    'pytest-xdist': 'xdist',
+    'pytest-json-report': 'pytest_jsonreport',
+}
+
+# Run timestamp embedded in every report file name, e.g. test_run_20250101_120000.log
+REPORT_TIMESTAMP_RE = re.compile(r'_(\d{8}_\d{6})\.')
+
 class Colors:
     """ANSI color codes for terminal output"""
     RED = '\033[91m'
@@ -55,6 +79,59 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
     END = '\033[0m'
+    
+    @classmethod
+    def disable(cls):
+        """Blank every code so piped output and CI logs stay plain text"""
+        for name in ('RED', 'GREEN', 'YELLOW', 'BLUE', 'MAGENTA', 'CYAN',
+                     'WHITE', 'BOLD', 'UNDERLINE', 'END'):
+            setattr(cls, name, '')
+
+def use_color() -> bool:
+    """Honour NO_COLOR / FORCE_COLOR, otherwise color only on a terminal"""
+    if os.environ.get('NO_COLOR'):
+        return False
+    if os.environ.get('FORCE_COLOR'):
+        return True
+    return sys.stdout.isatty()
+
+if not use_color():
+    Colors.disable()
+
+# Run health by failed-test count: 0, 1-9, 10-19, 20+. Shared by the console
+# summary and the markdown report; built after the color check above.
+HEALTH_CUTS = [1, 10, 20]
+HEALTH_TIERS = [
+    (Colors.GREEN, "🟢", "ALL TESTS PASSED"),
+    (Colors.YELLOW, "🟡", "MINOR ISSUES"),
+    (Colors.YELLOW, "🟠", "ATTENTION NEEDED"),
+    (Colors.RED, "🔴", "CRITICAL ISSUES"),
+]
+
+def health_tier(failed_tests: int) -> Tuple[str, str, str]:
+    """(color, icon, text) for a run with this many failed tests"""
+    return HEALTH_TIERS[bisect.bisect_right(HEALTH_CUTS, failed_tests)]
+
+def non_negative_int(value: str) -> int:
+    """argparse type for counts that must not be negative"""
+    count = int(value)
+    if count < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {count}")
+    return count
+
+class _TeeWriter(io.StringIO):
+    """stdout stand-in for in-process pytest: echoes to the console and keeps the text"""
+    
+    def __init__(self, console):
+        super().__init__()
+        self.console = console
+    
+    def write(self, text: str) -> int:
+        self.console.write(text)
+        return super().write(text)
+    
+    def flush(self):
+        self.console.flush()
 
 class TestRunner:
     """Comprehensive test runner with reporting capabilities"""
@@ -65,9 +142,24 @@ class TestRunner:
         self.backend_dir = self.project_root / "backend"
         self.reports_dir = self.project_root / "test_reports"
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Parallel unless opted out; check_dependencies turns it off without xdist
+        self.parallel = not args.no_parallel
+        # pytest.main() must not run twice in one interpreter: logging handlers
+        # and imported modules from the first session leak into the second
+        self.in_process = args.in_process and args.quick
+        
+        # Environment for pytest runs, with the backend on PYTHONPATH; built once
+        self.child_env = os.environ.copy()
+        pythonpath = str(self.backend_dir)
+        if 'PYTHONPATH' in self.child_env:
+            self.child_env['PYTHONPATH'] = f"{pythonpath}{os.pathsep}{self.child_env['PYTHONPATH']}"
+        else:
+            self.child_env['PYTHONPATH'] = pythonpath
         
         # Create reports directory
         self.reports_dir.mkdir(exist_ok=True)
+        if args.prune is not None:
+            self.prune_old_reports(args.prune)
         
         # Setup logging
         self.setup_logging()
@@ -77,18 +169,41 @@ class TestRunner:
         self.coverage_data = {}
         self.performance_metrics = {}
         
+    def prune_old_reports(self, keep: int):
+        """Delete report files from all but the `keep` most recent earlier runs
+        
+        Files are grouped by the run timestamp in their name, so a run's reports
+        are kept or removed together; coverage/ is rewritten each run and left alone.
+        """
+        def run_files():
+            with os.scandir(self.reports_dir) as entries:
+                for entry in entries:
+                    match = REPORT_TIMESTAMP_RE.search(entry.name)
+                    if match and entry.is_file():
+                        yield entry.path, match.group(1)
+        
+        # Timestamps sort chronologically as strings
+        kept_runs = set(heapq.nlargest(keep, {timestamp for _, timestamp in run_files()}))
+        for path, timestamp in list(run_files()):
+            if timestamp not in kept_runs:
+                os.remove(path)
+    
     def setup_logging(self):
         """Setup logging configuration"""
         log_file = self.reports_dir / f"test_run_{self.timestamp}.log"
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler() if self.args.verbose else logging.NullHandler()
-            ]
-        )
+        handlers = [logging.FileHandler(log_file)]
+        if self.args.verbose:
+            handlers.append(logging.StreamHandler())
+        
+        # Configure only this script's logger: root handlers would also pick up
+        # every record the app logs while suites run in-process
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
     
     def print_banner(self):
         """Print welcome banner"""
@@ -104,13 +219,26 @@ class TestRunner:
 ├── Mode: {'Quick' if self.args.quick else 'Comprehensive'}
 ├── Coverage: {'Enabled' if self.args.coverage else 'Disabled'}
 ├── Environment: {'Docker' if self.args.docker else 'Staging' if self.args.staging else 'Local'}
-├── Parallel: {'Enabled' if self.args.parallel else 'Disabled'}
+├── Parallel: {'Enabled' if self.parallel else 'Disabled'}
+├── Pytest: {'In-process' if self.in_process else 'Subprocess'}
 ├── Reports: {self.reports_dir}
 └── Timestamp: {self.timestamp}
 
 {Colors.GREEN}🚀 Starting test execution...{Colors.END}
 """
         print(banner)
+        if self.args.in_process and not self.in_process:
+            print(f"{Colors.YELLOW}⚠️  --in-process needs --quick (one suite); using subprocesses{Colors.END}")
+    
+    @staticmethod
+    def _is_installed(package: str) -> bool:
+        """Check a package is importable without executing it
+        
+        find_spec only locates the module, so probing matplotlib or plotly
+        doesn't pull in numpy and their whole import trees on every run.
+        """
+        module = IMPORT_NAMES.get(package, package.replace('-', '_'))
+        return importlib.util.find_spec(module) is not None
     
     def check_dependencies(self) -> bool:
         """Check if all required dependencies are installed"""
@@ -121,6 +249,7 @@ class TestRunner:
             'pytest-cov',
             'pytest-html',
             'pytest-asyncio',
+            'pytest-json-report',
             'httpx'
         ]
         
@@ -136,23 +265,25 @@ class TestRunner:
         # Check required packages
         missing_required = []
         for package in required_packages:
-            try:
-                __import__(package.replace('-', '_'))
+            if self._is_installed(package):
                 print(f"  ✅ {package}")
-            except ImportError:
+            else:
                 missing_required.append(package)
                 print(f"  ❌ {package} (REQUIRED)")
         
         # Check optional packages
         missing_optional = []
         for package in optional_packages:
-            try:
-                __import__(package.replace('-', '_'))
+            if self._is_installed(package):
                 print(f"  ✅ {package}")
-            except ImportError:
+            else:
                 missing_optional.append(package)
                 print(f"  ⚠️  {package} (optional)")
         
+        if 'pytest-xdist' in missing_optional and self.parallel:
+            print(f"\n{Colors.YELLOW}⚠️  pytest-xdist not installed, running tests serially{Colors.END}")
+            self.parallel = False
+        
         if missing_required:
             print(f"\n{Colors.RED}❌ Missing required packages: {', '.join(missing_required)}{Colors.END}")
             print(f"{Colors.YELLOW}💡 Install with: pip install {' '.join(missing_required)}{Colors.END}")
@@ -165,45 +296,110 @@ class TestRunner:
         return True
     
     def run_pytest_command(self, cmd: List[str], description: str) -> Tuple[int, str, str]:
-        """Run a pytest command and capture results"""
+        """Run a pytest command, streaming its output to the console
+        
+        Each suite runs in its own pytest subprocess. --in-process runs it via
+        pytest.main() instead, which is only safe for a single suite per
+        interpreter, so it is honoured together with --quick only.
+        """
         self.logger.info(f"Running: {description}")
         print(f"\n{Colors.CYAN}🔄 {description}...{Colors.END}")
         
         start_time = time.time()
         
-        # Set up environment with proper Python path
-        env = os.environ.copy()
-        pythonpath = str(self.backend_dir)
-        if 'PYTHONPATH' in env:
-            env['PYTHONPATH'] = f"{pythonpath}{os.pathsep}{env['PYTHONPATH']}"
+        if self.in_process:
+            # Drop the "python -m pytest" prefix
+            returncode, stdout, stderr = self._run_pytest_in_process(cmd[3:])
         else:
-            env['PYTHONPATH'] = pythonpath
+            returncode, stdout, stderr = self._run_pytest_subprocess(cmd)
+        
+        if stderr:
+            print(f"  ❌ {stderr}")
+            return returncode, stdout, stderr
+        
+        duration = time.time() - start_time
+        
+        if returncode == 0:
+            print(f"  ✅ Completed in {duration:.1f}s")
+        else:
+            print(f"  ⚠️  Completed with issues in {duration:.1f}s")
+        
+        return returncode, stdout, stderr
+    
+    def _run_pytest_in_process(self, args: List[str]) -> Tuple[int, str, str]:
+        """Run pytest.main() here, saving an interpreter start and plugin scan per suite
         
+        There's no timeout on this path; drop --in-process if one is needed.
+        """
+        import pytest
+        
+        output = _TeeWriter(sys.stdout)
+        saved_cwd = os.getcwd()
+        saved_environ = os.environ.copy()
+        saved_path = list(sys.path)
+        try:
+            # Match the subprocess: relative test paths, backend importable
+            # here and in any xdist workers
+            os.chdir(self.project_root)
+            os.environ.update(self.child_env)
+            sys.path.insert(0, str(self.backend_dir))
+            with contextlib.redirect_stdout(output):
+                returncode = int(pytest.main(args))
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            return 1, output.getvalue(), str(e)
+        finally:
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_environ)
+            sys.path[:] = saved_path
+        
+        return returncode, output.getvalue(), ""
+    
+    def _run_pytest_subprocess(self, cmd: List[str]) -> Tuple[int, str, str]:
+        """Run pytest in a fresh interpreter, killing it after 10 minutes"""
         try:
-            process = subprocess.run(
+            # stderr is folded into stdout so lines stay in pytest's order
+            process = subprocess.Popen(
                 cmd,
                 cwd=self.project_root,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=1,
                 text=True,
-                timeout=600,  # 10 minute timeout
-                env=env
+                env=self.child_env
             )
-            
-            duration = time.time() - start_time
-            
-            if process.returncode == 0:
-                print(f"  ✅ Completed in {duration:.1f}s")
-            else:
-                print(f"  ⚠️  Completed with issues in {duration:.1f}s")
-            
-            return process.returncode, process.stdout, process.stderr
-            
-        except subprocess.TimeoutExpired:
-            print(f"  ❌ Timeout after 10 minutes")
-            return 1, "", "Test execution timed out"
         except Exception as e:
-            print(f"  ❌ Error: {str(e)}")
             return 1, "", str(e)
+        
+        # Reading stdout blocks until pytest exits, so the timeout has to kill it
+        timed_out = threading.Event()
+        
+        def kill_on_timeout():
+            timed_out.set()
+            process.kill()
+        
+        timer = threading.Timer(600, kill_on_timeout)  # 10 minute timeout
+        timer.start()
+        output = io.StringIO()
+        try:
+            with process.stdout:
+                for line in process.stdout:
+                    sys.stdout.write(line)
+                    output.write(line)
+            returncode = process.wait()
+        except Exception as e:
+            process.kill()
+            process.wait()
+            return 1, output.getvalue(), str(e)
+        finally:
+            timer.cancel()
+        
+        if timed_out.is_set():
+            return 1, output.getvalue(), "Timeout after 10 minutes"
+        
+        return returncode, output.getvalue(), ""
     
     def run_basic_tests(self) -> Dict:
         """Run basic test suite"""
@@ -219,24 +415,44 @@ class TestRunner:
         else:
             test_files = ["backend/tests/"]
         
+        json_report = self.reports_dir / f"basic_{self.timestamp}.json"
+        
         # Build pytest command
         cmd = ["python", "-m", "pytest"] + test_files + [
             "-v",
             "--tb=short",
             f"--html={self.reports_dir}/basic_test_report_{self.timestamp}.html",
-            "--self-contained-html"
+            "--self-contained-html",
+            "--json-report",
+            f"--json-report-file={json_report}"
         ]
         
-        if self.args.parallel:
-            cmd.extend(["-n", "auto"])
+        if self.parallel:
+            # Idle workers steal queued tests, so slow modules don't strand the rest
+            cmd.extend(["-n", "auto", "--dist=worksteal"])
         
         if self.args.failures_only:
             cmd.append("--tb=line")
         
-        returncode, stdout, stderr = self.run_pytest_command(cmd, "Basic Test Suite")
+        if self.args.coverage:
+            # Measure coverage during this run rather than running every test again.
+            # This is the first suite, so no app module is imported yet even in-process.
+            coverage_dir = self.reports_dir / "coverage"
+            coverage_dir.mkdir(exist_ok=True)
+            coverage_json = self.reports_dir / f"coverage_{self.timestamp}.json"
+            cmd.extend([
+                "--cov=backend/app",
+                f"--cov-report=html:{coverage_dir}",
+                f"--cov-report=xml:{self.reports_dir}/coverage_{self.timestamp}.xml",
+                "--cov-report=term-missing",
+                f"--cov-report=json:{coverage_json}"
+            ])
+        
+        description = "Basic Test Suite with Coverage" if self.args.coverage else "Basic Test Suite"
+        returncode, stdout, stderr = self.run_pytest_command(cmd, description)
         
         # Parse results
-        results = self.parse_pytest_output(stdout)
+        results = self.parse_json_report(json_report)
         self.test_results['basic'] = {
             'returncode': returncode,
             'results': results,
@@ -244,41 +460,13 @@ class TestRunner:
             'stderr': stderr
         }
         
-        return results
-    
-    def run_coverage_tests(self) -> Dict:
-        """Run tests with coverage analysis"""
-        if not self.args.coverage:
-            return {}
-        
-        print(f"\n{Colors.BOLD}📊 COVERAGE ANALYSIS{Colors.END}")
-        
-        coverage_dir = self.reports_dir / "coverage"
-        coverage_dir.mkdir(exist_ok=True)
-        
-        cmd = [
-            "python", "-m", "pytest",
-            "backend/tests/",
-            "--cov=backend/app",
-            f"--cov-report=html:{coverage_dir}",
-            f"--cov-report=xml:{self.reports_dir}/coverage_{self.timestamp}.xml",
-            "--cov-report=term-missing",
-            "--cov-report=json",
-            "-v"
-        ]
-        
-        returncode, stdout, stderr = self.run_pytest_command(cmd, "Coverage Analysis")
-        
-        # Parse coverage data
-        coverage_data = self.parse_coverage_output(stdout)
-        self.test_results['coverage'] = {
-            'returncode': returncode,
-            'data': coverage_data,
-            'stdout': stdout,
-            'stderr': stderr
-        }
+        if self.args.coverage:
+            self.test_results['coverage'] = {
+                'returncode': returncode,
+                'data': self.parse_coverage_report(coverage_json)
+            }
         
-        return coverage_data
+        return results
     
     def run_performance_tests(self) -> Dict:
         """Run performance and stress tests"""
@@ -301,6 +489,11 @@ class TestRunner:
             "--self-contained-html"
         ]
         
+        if self.parallel:
+            # Keep each performance module on one worker so its class-scoped
+            # fixtures (e.g. the mocked Gemini service) are built only once
+            cmd.extend(["-n", "auto", "--dist=loadfile"])
+        
         returncode, stdout, stderr = self.run_pytest_command(cmd, "Performance Tests")
         
         # Parse performance metrics
@@ -314,8 +507,8 @@ class TestRunner:
         
         return metrics
     
-    def parse_pytest_output(self, output: str) -> Dict:
-        """Parse pytest output to extract test results"""
+    def parse_json_report(self, report_path: Path) -> Dict:
+        """Load test results from pytest-json-report's output"""
         results = {
             'total': 0,
             'passed': 0,
@@ -327,37 +520,33 @@ class TestRunner:
             'categories': {}
         }
         
-        lines = output.split('\n')
-        
-        for line in lines:
-            # Parse summary line
-            if 'failed' in line and 'passed' in line:
-                # Example: "39 failed, 169 passed, 410 warnings in 38.17s"
-                parts = line.split()
-                for i, part in enumerate(parts):
-                    if part == 'failed,' and i > 0:
-                        results['failed'] = int(parts[i-1])
-                    elif part == 'passed,' and i > 0:
-                        results['passed'] = int(parts[i-1])
-                    elif part == 'warnings' and i > 0:
-                        results['warnings'] = int(parts[i-1])
-                    elif part.endswith('s') and 'in' in parts[i-1:i+1]:
-                        try:
-                            results['duration'] = float(part[:-1])
-                        except ValueError:
-                            pass
-            
-            # Parse failed tests
-            elif 'FAILED' in line and '::' in line:
-                test_name = line.split('FAILED')[1].strip().split(' ')[0]
-                results['failed_tests'].append(test_name)
-        
-        results['total'] = results['passed'] + results['failed'] + results['skipped']
+        try:
+            with open(report_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read test report {report_path}: {e}")
+            return results
+        
+        summary = data['summary']
+        results['total'] = summary.get('total', 0)
+        results['passed'] = summary.get('passed', 0)
+        # Setup/teardown errors fail the run too
+        results['failed'] = summary.get('failed', 0) + summary.get('error', 0)
+        results['skipped'] = summary.get('skipped', 0)
+        results['warnings'] = len(data.get('warnings', []))
+        results['duration'] = data.get('duration', 0.0)
+        
+        # Group failures by test file
+        for test in data.get('tests', []):
+            if test['outcome'] in ('failed', 'error'):
+                results['failed_tests'].append(test['nodeid'])
+                category = test['nodeid'].split('::')[0]
+                results['categories'][category] = results['categories'].get(category, 0) + 1
         
         return results
     
-    def parse_coverage_output(self, output: str) -> Dict:
-        """Parse coverage output"""
+    def parse_coverage_report(self, report_path: Path) -> Dict:
+        """Load totals and per-file data from coverage.py's JSON report"""
         coverage = {
             'total_coverage': 0.0,
             'files': {},
@@ -366,18 +555,21 @@ class TestRunner:
             'missing': 0
         }
         
-        lines = output.split('\n')
-        
-        for line in lines:
-            if 'TOTAL' in line and '%' in line:
-                # Extract total coverage percentage
-                parts = line.split()
-                for part in parts:
-                    if part.endswith('%'):
-                        try:
-                            coverage['total_coverage'] = float(part[:-1])
-                        except ValueError:
-                            pass
+        try:
+            with open(report_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read coverage report {report_path}: {e}")
+            return coverage
+        
+        totals = data['totals']
+        coverage['total_coverage'] = totals['percent_covered']
+        coverage['statements'] = totals['num_statements']
+        coverage['missing'] = totals['missing_lines']
+        coverage['files'] = data['files']
+        coverage['missing_lines'] = {
+            path: file_data['missing_lines'] for path, file_data in data['files'].items()
+        }
         
         return coverage
     
@@ -399,17 +591,32 @@ class TestRunner:
         """Generate comprehensive summary report"""
         print(f"\n{Colors.BOLD}📑 GENERATING REPORTS{Colors.END}")
         
+        # Raw pytest output is already in each suite's HTML report
+        test_results = {
+            suite: {key: value for key, value in result.items() if key not in ('stdout', 'stderr')}
+            for suite, result in self.test_results.items()
+        }
+        
         summary = {
             'timestamp': self.timestamp,
-            'test_results': self.test_results,
+            # One "Generated" time shared by every report
+            'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'test_results': test_results,
             'coverage_data': self.coverage_data,
             'performance_metrics': self.performance_metrics
         }
+        # Read by every report generator and by print_summary
+        self.report_stats = self._report_stats(summary)
         
         # Save JSON summary
-        summary_file = self.reports_dir / f"test_summary_{self.timestamp}.json"
-        with open(summary_file, 'w') as f:
-            json.dump(summary, f, indent=2, default=str)
+        if not self.args.no_json_summary:
+            summary_file = self.reports_dir / f"test_summary_{self.timestamp}.json"
+            if orjson is not None:
+                with open(summary_file, 'wb') as f:
+                    f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2, default=str))
+            else:
+                with open(summary_file, 'w') as f:
+                    json.dump(summary, f, indent=2, default=str)
         
         # Generate markdown report
         self.generate_markdown_report(summary)
@@ -424,36 +631,54 @@ class TestRunner:
         
         print(f"  ✅ Reports saved to: {self.reports_dir}")
     
+    def _report_stats(self, summary: Dict) -> Dict:
+        """Figures shared by the reports and the console summary"""
+        basic_results = summary['test_results'].get('basic', {}).get('results', {})
+        total = basic_results.get('total', 0)
+        passed = basic_results.get('passed', 0)
+        return {
+            'total': total,
+            'passed': passed,
+            'failed': basic_results.get('failed', 0),
+            'success_rate': passed / max(total, 1) * 100,
+            'duration': basic_results.get('duration', 0),
+            'failed_tests': basic_results.get('failed_tests', []),
+            'generated': summary['generated_at']
+        }
+    
     def generate_markdown_report(self, summary: Dict):
         """Generate detailed markdown report"""
         report_file = self.reports_dir / f"COMPREHENSIVE_TEST_REPORT_{self.timestamp}.md"
         
-        basic_results = summary['test_results'].get('basic', {}).get('results', {})
+        stats = self.report_stats
+        _, health_icon, health_text = health_tier(stats['failed'])
+        failed_list = ''.join(f"- `{test}`\n" for test in stats['failed_tests'])
+        summary_line = (
+            '' if self.args.no_json_summary
+            else f"- Test Summary: `test_summary_{self.timestamp}.json`\n"
+        )
         
         content = f"""# 🧪 Comprehensive Test Report
 
-**Generated**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}  
+**Generated**: {stats['generated']}  
 **Test Run ID**: {self.timestamp}
 
 ## 📊 Executive Summary
 
 ### Test Results Overview
-- **Total Tests**: {basic_results.get('total', 0)}
-- **Passed**: {basic_results.get('passed', 0)} ✅
-- **Failed**: {basic_results.get('failed', 0)} ❌
-- **Success Rate**: {(basic_results.get('passed', 0) / max(basic_results.get('total', 1), 1) * 100):.1f}%
-- **Duration**: {basic_results.get('duration', 0):.1f} seconds
+- **Total Tests**: {stats['total']}
+- **Passed**: {stats['passed']} ✅
+- **Failed**: {stats['failed']} ❌
+- **Success Rate**: {stats['success_rate']:.1f}%
+- **Duration**: {stats['duration']:.1f} seconds
 
 ### Health Check
-{'🟢 HEALTHY' if basic_results.get('failed', 0) < 10 else '🟡 NEEDS ATTENTION' if basic_results.get('failed', 0) < 20 else '🔴 CRITICAL'}
+{health_icon} {health_text}
 
 ## 📋 Detailed Results
 
-### Failed Tests ({basic_results.get('failed', 0)})
-"""
-        
-        for test in basic_results.get('failed_tests', []):
-            content += f"- `{test}`\n"
+### Failed Tests ({stats['failed']})
+{failed_list}"""
         
         if 'coverage' in summary['test_results']:
             coverage_data = summary['test_results']['coverage']['data']
@@ -469,8 +694,7 @@ class TestRunner:
 {'Performance tests were skipped (quick mode)' if self.args.quick else 'See performance section below'}
 
 ## 📁 Generated Files
-- Test Summary: `test_summary_{self.timestamp}.json`
-- Basic Test Report: `basic_test_report_{self.timestamp}.html`
+{summary_line}- Basic Test Report: `basic_test_report_{self.timestamp}.html`
 - Coverage Report: `coverage/index.html`
 - Log File: `test_run_{self.timestamp}.log`
 
@@ -516,14 +740,14 @@ class TestRunner:
             story.append(Spacer(1, 12))
             
             # Summary
-            basic_results = summary['test_results'].get('basic', {}).get('results', {})
+            stats = self.report_stats
             summary_text = f"""
             <b>Test Summary:</b><br/>
-            Total Tests: {basic_results.get('total', 0)}<br/>
-            Passed: {basic_results.get('passed', 0)}<br/>
-            Failed: {basic_results.get('failed', 0)}<br/>
-            Success Rate: {(basic_results.get('passed', 0) / max(basic_results.get('total', 1), 1) * 100):.1f}%<br/>
-            Duration: {basic_results.get('duration', 0):.1f} seconds
+            Total Tests: {stats['total']}<br/>
+            Passed: {stats['passed']}<br/>
+            Failed: {stats['failed']}<br/>
+            Success Rate: {stats['success_rate']:.1f}%<br/>
+            Duration: {stats['duration']:.1f} seconds
             """
             
             summary_para = Paragraph(summary_text, styles['Normal'])
@@ -540,7 +764,11 @@ class TestRunner:
         try:
             dashboard_file = self.reports_dir / f"dashboard_{self.timestamp}.html"
             
-            basic_results = summary['test_results'].get('basic', {}).get('results', {})
+            stats = self.report_stats
+            # Parametrized test IDs can contain <, > or &
+            failed_items = ''.join(
+                f"<li><code>{html.escape(test)}</code></li>\n" for test in stats['failed_tests']
+            )
             
             html_content = f"""
 <!DOCTYPE html>
@@ -563,24 +791,24 @@ class TestRunner:
     <div class="container">
         <div class="header">
             <h1>🧪 AI Recipe Generator Test Dashboard</h1>
-            <p>Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+            <p>Generated: {stats['generated']}</p>
         </div>
         
         <div class="metrics">
             <div class="metric-card">
-                <div class="metric-value">{basic_results.get('total', 0)}</div>
+                <div class="metric-value">{stats['total']}</div>
                 <div class="metric-label">Total Tests</div>
             </div>
             <div class="metric-card">
-                <div class="metric-value">{basic_results.get('passed', 0)}</div>
+                <div class="metric-value">{stats['passed']}</div>
                 <div class="metric-label">Passed</div>
             </div>
             <div class="metric-card">
-                <div class="metric-value">{basic_results.get('failed', 0)}</div>
+                <div class="metric-value">{stats['failed']}</div>
                 <div class="metric-label">Failed</div>
             </div>
             <div class="metric-card">
-                <div class="metric-value">{(basic_results.get('passed', 0) / max(basic_results.get('total', 1), 1) * 100):.1f}%</div>
+                <div class="metric-value">{stats['success_rate']:.1f}%</div>
                 <div class="metric-label">Success Rate</div>
             </div>
         </div>
@@ -592,12 +820,7 @@ class TestRunner:
         <div class="failed-tests">
             <h3>Failed Tests</h3>
             <ul>
-"""
-            
-            for test in basic_results.get('failed_tests', []):
-                html_content += f"<li><code>{test}</code></li>\n"
-            
-            html_content += f"""
+{failed_items}
             </ul>
         </div>
     </div>
@@ -605,7 +828,7 @@ class TestRunner:
     <script>
         // Create pie chart
         var data = [{{
-            values: [{basic_results.get('passed', 0)}, {basic_results.get('failed', 0)}],
+            values: [{stats['passed']}, {stats['failed']}],
             labels: ['Passed', 'Failed'],
             type: 'pie',
             marker: {{
@@ -634,45 +857,27 @@ class TestRunner:
     
     def print_summary(self):
         """Print final summary to console"""
-        basic_results = self.test_results.get('basic', {}).get('results', {})
+        stats = self.report_stats
         
         print(f"\n{Colors.BOLD}{'='*80}{Colors.END}")
         print(f"{Colors.BOLD}{Colors.CYAN}🎯 FINAL SUMMARY{Colors.END}")
         print(f"{Colors.BOLD}{'='*80}{Colors.END}")
         
         # Overall status
-        total_tests = basic_results.get('total', 0)
-        failed_tests = basic_results.get('failed', 0)
-        passed_tests = basic_results.get('passed', 0)
-        success_rate = (passed_tests / max(total_tests, 1)) * 100
+        failed_tests = stats['failed']
         
-        if failed_tests == 0:
-            status_color = Colors.GREEN
-            status_icon = "🟢"
-            status_text = "ALL TESTS PASSED"
-        elif failed_tests < 10:
-            status_color = Colors.YELLOW
-            status_icon = "🟡"
-            status_text = "MINOR ISSUES"
-        elif failed_tests < 20:
-            status_color = Colors.YELLOW
-            status_icon = "🟠"
-            status_text = "ATTENTION NEEDED"
-        else:
-            status_color = Colors.RED
-            status_icon = "🔴"
-            status_text = "CRITICAL ISSUES"
+        status_color, status_icon, status_text = health_tier(failed_tests)
         
         print(f"{status_color}{Colors.BOLD}{status_icon} {status_text}{Colors.END}")
         print()
         
         # Metrics
         print(f"{Colors.BOLD}📊 Test Metrics:{Colors.END}")
-        print(f"├── Total Tests: {Colors.BOLD}{total_tests}{Colors.END}")
-        print(f"├── Passed: {Colors.GREEN}{passed_tests}{Colors.END}")
+        print(f"├── Total Tests: {Colors.BOLD}{stats['total']}{Colors.END}")
+        print(f"├── Passed: {Colors.GREEN}{stats['passed']}{Colors.END}")
         print(f"├── Failed: {Colors.RED}{failed_tests}{Colors.END}")
-        print(f"├── Success Rate: {Colors.BOLD}{success_rate:.1f}%{Colors.END}")
-        print(f"└── Duration: {Colors.BOLD}{basic_results.get('duration', 0):.1f}s{Colors.END}")
+        print(f"├── Success Rate: {Colors.BOLD}{stats['success_rate']:.1f}%{Colors.END}")
+        print(f"└── Duration: {Colors.BOLD}{stats['duration']:.1f}s{Colors.END}")
         
         # Coverage info
         if 'coverage' in self.test_results:
@@ -697,7 +902,8 @@ class TestRunner:
         # File locations
         print(f"\n{Colors.BOLD}📁 Generated Reports:{Colors.END}")
         print(f"├── 📊 Reports Directory: {self.reports_dir}")
-        print(f"├── 📄 Test Summary: test_summary_{self.timestamp}.json")
+        if not self.args.no_json_summary:
+            print(f"├── 📄 Test Summary: test_summary_{self.timestamp}.json")
         print(f"├── 🌐 HTML Report: basic_test_report_{self.timestamp}.html")
         if self.args.coverage:
             print(f"├── 📈 Coverage: coverage/index.html")
@@ -720,11 +926,9 @@ class TestRunner:
                 sys.exit(1)
             
             # Run test suites
+            # Also collects coverage when --coverage is given
             self.run_basic_tests()
             
-            if self.args.coverage:
-                self.run_coverage_tests()
-            
             if not self.args.quick:
                 self.run_performance_tests()
             
@@ -735,8 +939,7 @@ class TestRunner:
             self.print_summary()
             
             # Exit with appropriate code
-            basic_results = self.test_results.get('basic', {}).get('results', {})
-            if basic_results.get('failed', 0) == 0:
+            if self.report_stats['failed'] == 0:
                 sys.exit(0)
             else:
                 sys.exit(1)
@@ -759,7 +962,7 @@ Examples:
   python run_comprehensive_tests.py                    # Run full test suite
   python run_comprehensive_tests.py --quick           # Quick test run
   python run_comprehensive_tests.py --coverage --pdf  # With coverage and PDF
-  python run_comprehensive_tests.py --parallel        # Parallel execution
+  python run_comprehensive_tests.py --no-parallel     # Serial execution
   python run_comprehensive_tests.py --docker          # Test Docker deployment
         """
     )
@@ -775,7 +978,15 @@ Examples:
     parser.add_argument('--failures-only', action='store_true',
                        help='Show only failed tests')
     parser.add_argument('--parallel', action='store_true',
-                       help='Run tests in parallel (faster)')
+                       help='Run tests in parallel (the default; kept for compatibility)')
+    parser.add_argument('--no-parallel', action='store_true',
+                       help='Run tests serially instead of with pytest-xdist')
+    parser.add_argument('--prune', type=non_negative_int, metavar='N',
+                       help='Delete reports from all but the N most recent earlier runs')
+    parser.add_argument('--no-json-summary', action='store_true',
+                       help='Skip writing the JSON test summary')
+    parser.add_argument('--in-process', action='store_true',
+                       help='Run pytest in this interpreter instead of a subprocess (only with --quick)')
     parser.add_argument('--docker', action='store_true',
                        help='Test against Docker containers')
     parser.add_argument('--staging', action='store_true',
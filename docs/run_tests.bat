@@ -37,7 +37,7 @@ echo ✅ Test script found
 REM Install required dependencies
 echo.
 echo 📦 Installing/checking dependencies...
-pip install pytest pytest-cov pytest-html pytest-asyncio httpx requests
+pip install pytest pytest-cov pytest-html pytest-asyncio pytest-json-report httpx requests
 
 REM Optional dependencies for enhanced features
 echo.
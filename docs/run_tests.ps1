@@ -114,6 +114,7 @@ function Install-Dependencies {
         "pytest-cov", 
         "pytest-html",
         "pytest-asyncio",
+        "pytest-json-report",
         "httpx",
         "requests"
     )
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Run the API smoke tests and the async LLM tests in one process
+Both scripts share one interpreter and event loop, so imports are paid once
+"""
+
+import asyncio
+
+from test_api_simple import run_full_test_suite
+from test_async_llm import main as run_async_llm_tests
+
+
+async def main():
+    """Run the API smoke tests, then the async LLM tests"""
+    await run_full_test_suite()
+    print()
+    await run_async_llm_tests()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
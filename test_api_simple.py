@@ -4,45 +4,92 @@ Simple API Testing Script for AI Recipes Generator
 Tests all main API endpoints: POST /api/recipes/generate, GET /api/recipes, POST /api/recipes, DELETE /api/recipes/{id}, GET /api/stats
 """
 
-import requests
+import asyncio
+import httpx
 import json
-import time
-from typing import Dict, Any
+
+try:
+    import orjson
+except ImportError:  # orjson ships with the backend requirements, not with this script
+    orjson = None
 
 # Configuration
 BASE_URL = "http://localhost:8000"
-API_BASE = f"{BASE_URL}/api"
 
-def test_health_check():
+# Above the backend's 30s Gemini timeout, so a slow generation fails server-side first
+REQUEST_TIMEOUT = 60
+
+# The health check runs first and only needs to know the server is up, so an
+# unreachable host fails within seconds instead of waiting out REQUEST_TIMEOUT
+HEALTH_TIMEOUT = httpx.Timeout(5, connect=2)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# (label, results key) for each row of the final summary
+_SUMMARY_SPEC = (
+    ("Recipe Generation", "generation"),
+    ("Get Recipes", "get_recipes_before"),
+    ("Create Recipe", "create_recipe"),
+    ("Get Stats", "stats"),
+    ("Delete Recipe", "delete_recipe"),
+)
+
+def _json_loads(content: bytes):
+    """Decode a response body, with orjson when it is installed"""
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+def _json_dumps(payload) -> bytes:
+    """Encode a request body, with orjson when it is installed"""
+    return orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode()
+
+# The request bodies never change, so they are encoded once at import
+_GEN_BODY = _json_dumps({
+    "ingredients": ["chicken", "pasta", "tomatoes", "garlic"],
+    "meal_type": "dinner",
+    "dietary_preferences": [],
+    "cuisine_type": "Italian"
+})
+
+_CREATE_BODY = _json_dumps({
+    "title": "Test Spaghetti Carbonara",
+    "description": "A classic Italian pasta dish with eggs, cheese, and pancetta",
+    "instructions": "1. Cook spaghetti according to package directions. 2. Mix eggs and cheese in a bowl. 3. Cook pancetta until crispy. 4. Combine all ingredients while pasta is hot.",
+    "ingredients": [
+        {"name": "spaghetti", "amount": "400", "unit": "g"},
+        {"name": "eggs", "amount": "4", "unit": "large"},
+        {"name": "parmesan cheese", "amount": "100", "unit": "g"},
+        {"name": "pancetta", "amount": "150", "unit": "g"}
+    ],
+    "prep_time": 10,
+    "cook_time": 15,
+    "servings": 4,
+    "difficulty": "Medium",
+    "cuisine_type": "Italian"
+})
+
+async def test_health_check(client: httpx.AsyncClient):
     """Test if the API is running"""
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = await client.get("/health", timeout=HEALTH_TIMEOUT)
         if response.status_code == 200:
             print("✅ API is running and healthy")
             return True
         else:
             print(f"❌ API health check failed: {response.status_code}")
             return False
-    except requests.ConnectionError:
+    except httpx.TransportError:  # refused, reset or timed out
         print("❌ Cannot connect to API. Make sure the server is running on http://localhost:8000")
         return False
 
-def test_recipe_generation():
+async def test_recipe_generation(client: httpx.AsyncClient):
     """Test POST /api/recipes/generate"""
     print("\n🧪 Testing Recipe Generation (POST /api/recipes/generate)")
     
-    test_data = {
-        "ingredients": ["chicken", "pasta", "tomatoes", "garlic"],
-        "meal_type": "dinner",
-        "dietary_preferences": [],
-        "cuisine_type": "Italian"
-    }
-    
     try:
-        response = requests.post(f"{API_BASE}/recipes/generate", json=test_data)
+        response = await client.post("/api/recipes/generate", content=_GEN_BODY, headers=JSON_HEADERS)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             print(f"✅ Recipe generation successful!")
             print(f"   Generated {len(data.get('recipes', []))} recipes")
             
@@ -62,62 +109,48 @@ def test_recipe_generation():
         print(f"❌ Recipe generation error: {str(e)}")
         return None
 
-def test_get_recipes():
+async def test_get_recipes(client: httpx.AsyncClient):
     """Test GET /api/recipes"""
-    print("\n🧪 Testing Get All Recipes (GET /api/recipes)")
+    # Runs alongside other tests, so its report is written in one piece
+    lines = ["\n🧪 Testing Get All Recipes (GET /api/recipes)"]
     
     try:
-        response = requests.get(f"{API_BASE}/recipes")
+        response = await client.get("/api/recipes")
         
         if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Get recipes successful!")
-            print(f"   Total recipes found: {len(data)}")
+            data = _json_loads(response.content)
+            lines.append(f"✅ Get recipes successful!")
+            lines.append(f"   Total recipes found: {len(data)}")
             
             if data:
-                print("   Sample recipes:")
+                lines.append("   Sample recipes:")
                 try:
                     for i, recipe in enumerate(data[:3]):  # Show first 3
-                        print(f"   {i+1}. {recipe.get('title', 'N/A')} (ID: {recipe.get('id', 'N/A')})")
+                        lines.append(f"   {i+1}. {recipe.get('title', 'N/A')} (ID: {recipe.get('id', 'N/A')})")
                 except Exception as e:
-                    print(f"   Error displaying recipes: {str(e)}")
+                    lines.append(f"   Error displaying recipes: {str(e)}")
             
             return data
         else:
-            print(f"❌ Get recipes failed: {response.status_code}")
-            print(f"   Error: {response.text}")
+            lines.append(f"❌ Get recipes failed: {response.status_code}")
+            lines.append(f"   Error: {response.text}")
             return None
             
     except Exception as e:
-        print(f"❌ Get recipes error: {str(e)}")
+        lines.append(f"❌ Get recipes error: {str(e)}")
         return None
+    finally:
+        print("\n".join(lines))
 
-def test_create_recipe():
+async def test_create_recipe(client: httpx.AsyncClient):
     """Test POST /api/recipes"""
     print("\n🧪 Testing Create Recipe (POST /api/recipes)")
     
-    test_recipe = {
-        "title": "Test Spaghetti Carbonara",
-        "description": "A classic Italian pasta dish with eggs, cheese, and pancetta",
-        "instructions": "1. Cook spaghetti according to package directions. 2. Mix eggs and cheese in a bowl. 3. Cook pancetta until crispy. 4. Combine all ingredients while pasta is hot.",
-        "ingredients": [
-            {"name": "spaghetti", "amount": "400", "unit": "g"},
-            {"name": "eggs", "amount": "4", "unit": "large"},
-            {"name": "parmesan cheese", "amount": "100", "unit": "g"},
-            {"name": "pancetta", "amount": "150", "unit": "g"}
-        ],
-        "prep_time": 10,
-        "cook_time": 15,
-        "servings": 4,
-        "difficulty": "Medium",
-        "cuisine_type": "Italian"
-    }
-    
     try:
-        response = requests.post(f"{API_BASE}/recipes", json=test_recipe)
+        response = await client.post("/api/recipes", content=_CREATE_BODY, headers=JSON_HEADERS)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             print(f"✅ Recipe creation successful!")
             print(f"   Created recipe ID: {data.get('id')}")
             print(f"   Title: {data.get('title')}")
@@ -133,12 +166,12 @@ def test_create_recipe():
         print(f"❌ Recipe creation error: {str(e)}")
         return None
 
-def test_delete_recipe(recipe_id: int):
+async def test_delete_recipe(client: httpx.AsyncClient, recipe_id: int):
     """Test DELETE /api/recipes/{id}"""
     print(f"\n🧪 Testing Delete Recipe (DELETE /api/recipes/{recipe_id})")
     
     try:
-        response = requests.delete(f"{API_BASE}/recipes/{recipe_id}")
+        response = await client.delete(f"/api/recipes/{recipe_id}")
         
         if response.status_code == 200:
             print(f"✅ Recipe deletion successful!")
@@ -156,15 +189,15 @@ def test_delete_recipe(recipe_id: int):
         print(f"❌ Recipe deletion error: {str(e)}")
         return False
 
-def test_get_stats():
+async def test_get_stats(client: httpx.AsyncClient):
     """Test GET /api/stats"""
     print("\n🧪 Testing Get Stats (GET /api/stats)")
     
     try:
-        response = requests.get(f"{API_BASE}/stats")
+        response = await client.get("/api/stats")
         
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             print(f"✅ Get stats successful!")
             print(f"   Total recipes: {data.get('total_recipes', 'N/A')}")
             print(f"   Average rating: {data.get('average_rating', 'N/A')}")
@@ -181,78 +214,73 @@ def test_get_stats():
         print(f"❌ Get stats error: {str(e)}")
         return None
 
-def run_full_test_suite():
-    """Run all API tests in sequence"""
+async def run_full_test_suite():
+    """Run all API tests, overlapping the ones that don't depend on each other"""
     print("🚀 Starting API Test Suite")
     print("=" * 50)
     
-    # Check if API is running
-    if not test_health_check():
-        print("\n❌ Cannot proceed with tests. Please start the API server first.")
-        print("Run: docker-compose up -d")
-        return
-    
-    results = {}
-    
-    # Test 1: Recipe Generation
-    results['generation'] = test_recipe_generation()
-    
-    # Test 2: Get All Recipes (before creating new ones)
-    results['get_recipes_before'] = test_get_recipes()
-    
-    # Test 3: Create Recipe
-    results['create_recipe'] = test_create_recipe()
-    created_recipe_id = results['create_recipe'].get('id') if results['create_recipe'] else None
-    
-    # Test 4: Get All Recipes (after creating new one)
-    results['get_recipes_after'] = test_get_recipes()
-    
-    # Test 5: Get Stats
-    results['stats'] = test_get_stats()
-    
-    # Test 6: Delete Recipe (if we created one)
-    if created_recipe_id:
-        results['delete_recipe'] = test_delete_recipe(created_recipe_id)
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+        timeout=REQUEST_TIMEOUT,
+        # Plain http:// never needs the CA bundle, so skip loading it
+        verify=BASE_URL.startswith("https://"),
+    ) as client:
+        # Check if API is running
+        if not await test_health_check(client):
+            print("\n❌ Cannot proceed with tests. Please start the API server first.")
+            print("Run: docker-compose up -d")
+            return
+        
+        results = {}
+        
+        # Tests 1, 2 and 5: Recipe Generation, Get All Recipes (before creating
+        # new ones) and Get Stats are independent, so run them together
+        (
+            results['generation'],
+            results['get_recipes_before'],
+            results['stats'],
+        ) = await asyncio.gather(
+            test_recipe_generation(client),
+            test_get_recipes(client),
+            test_get_stats(client),
+        )
         
-        # Verify deletion by getting recipes again
-        print("\n🧪 Verifying deletion...")
-        final_recipes = test_get_recipes()
-        if final_recipes:
-            deleted_successfully = not any(r.get('id') == created_recipe_id for r in final_recipes)
-            if deleted_successfully:
+        # Test 3: Create Recipe
+        results['create_recipe'] = await test_create_recipe(client)
+        created_recipe_id = results['create_recipe'].get('id') if results['create_recipe'] else None
+        
+        # Test 6: Delete Recipe (if we created one)
+        if created_recipe_id:
+            results['delete_recipe'] = await test_delete_recipe(client, created_recipe_id)
+            
+            # Verify deletion by fetching just that recipe, not the whole list
+            print("\n🧪 Verifying deletion...")
+            response = await client.get(f"/api/recipes/{created_recipe_id}")
+            if response.status_code == 404:
                 print("✅ Recipe deletion verified!")
             else:
                 print("❌ Recipe still exists after deletion")
     
     # Summary
-    print("\n" + "=" * 50)
-    print("📊 TEST SUMMARY")
-    print("=" * 50)
+    lines = ["\n" + "=" * 50, "📊 TEST SUMMARY", "=" * 50]
     
     passed = 0
-    total = 0
+    for test_name, key in _SUMMARY_SPEC:
+        # Helpers return None on failure, except delete which returns False
+        success = results.get(key) not in (None, False)
+        lines.append(f"{test_name:<20} {'✅ PASS' if success else '❌ FAIL'}")
+        passed += success
+    total = len(_SUMMARY_SPEC)
     
-    tests = [
-        ("Recipe Generation", results.get('generation') is not None),
-        ("Get Recipes", results.get('get_recipes_before') is not None),
-        ("Create Recipe", results.get('create_recipe') is not None),
-        ("Get Stats", results.get('stats') is not None),
-        ("Delete Recipe", results.get('delete_recipe', False))
-    ]
-    
-    for test_name, success in tests:
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{test_name:<20} {status}")
-        if success:
-            passed += 1
-        total += 1
-    
-    print(f"\nResults: {passed}/{total} tests passed")
+    lines.append(f"\nResults: {passed}/{total} tests passed")
     
     if passed == total:
-        print("🎉 All tests passed! Your API is working correctly.")
+        lines.append("🎉 All tests passed! Your API is working correctly.")
     else:
-        print("⚠️  Some tests failed. Check the error messages above.")
+        lines.append("⚠️  Some tests failed. Check the error messages above.")
+    
+    print("\n".join(lines))
 
 if __name__ == "__main__":
-    run_full_test_suite()
+    asyncio.run(run_full_test_suite())
@@ -4,6 +4,7 @@ Test script for async LLM implementation
 Run this to verify that async operations are working correctly
 """
 
+import aiohttp
 import asyncio
 import time
 import logging
@@ -14,64 +15,66 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def test_single_generation():
+async def test_single_generation(service: GeminiService):
     """Test single async recipe generation"""
     print("🧪 Testing single recipe generation...")
     
-    async with GeminiService() as service:
-        start_time = time.time()
-        
-        recipes = await service.generate_recipes(
-            ingredients=["chicken", "rice", "vegetables"],
-            dietary_preferences=["gluten-free"],
-            cuisine_type="Asian",
-            meal_type="dinner"
-        )
-        
-        end_time = time.time()
-        
-        print(f"✅ Generated {len(recipes)} recipes in {end_time - start_time:.2f} seconds")
-        for recipe in recipes:
-            print(f"   - {recipe.get('title', 'Untitled Recipe')}")
+    start_time = time.perf_counter()
+    
+    recipes = await service.generate_recipes(
+        ingredients=["chicken", "rice", "vegetables"],
+        dietary_preferences=["gluten-free"],
+        cuisine_type="Asian",
+        meal_type="dinner"
+    )
+    
+    end_time = time.perf_counter()
+    
+    print(f"✅ Generated {len(recipes)} recipes in {end_time - start_time:.2f} seconds")
+    for recipe in recipes:
+        print(f"   - {recipe.get('title', 'Untitled Recipe')}")
 
 
-async def test_concurrent_generation():
+async def test_concurrent_generation(service: GeminiService):
     """Test concurrent async recipe generation"""
     print("\n🧪 Testing concurrent recipe generation...")
     
-    async with GeminiService() as service:
-        # Create multiple tasks
+    start_time = time.perf_counter()
+    total_recipes = 0
+    
+    # Execute concurrently; if one generation fails the others are cancelled
+    async with asyncio.TaskGroup() as tg:
         tasks = [
-            service.generate_recipes(
+            tg.create_task(service.generate_recipes(
                 ingredients=["pasta", "tomatoes", "basil"],
                 cuisine_type="Italian"
-            ),
-            service.generate_recipes(
+            ), name="Italian"),
+            tg.create_task(service.generate_recipes(
                 ingredients=["beef", "potatoes", "onions"],
                 cuisine_type="American"
-            ),
-            service.generate_recipes(
+            ), name="American"),
+            tg.create_task(service.generate_recipes(
                 ingredients=["salmon", "rice", "soy sauce"],
                 cuisine_type="Japanese"
-            )
+            ), name="Japanese")
         ]
         
-        start_time = time.time()
-        
-        # Execute concurrently
-        results = await asyncio.gather(*tasks)
-        
-        end_time = time.time()
-        
-        total_recipes = sum(len(result) for result in results)
-        print(f"✅ Generated {total_recipes} recipes across {len(tasks)} cuisines in {end_time - start_time:.2f} seconds")
-        
-        for i, recipes in enumerate(results):
-            cuisine = ["Italian", "American", "Japanese"][i]
-            print(f"   {cuisine}: {len(recipes)} recipes")
+        # Report each cuisine as soon as it finishes rather than after the slowest
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                recipes = task.result()
+                total_recipes += len(recipes)
+                print(f"   {task.get_name()}: {len(recipes)} recipes "
+                      f"(done in {time.perf_counter() - start_time:.2f}s)")
+    
+    end_time = time.perf_counter()
+    
+    print(f"✅ Generated {total_recipes} recipes across {len(tasks)} cuisines in {end_time - start_time:.2f} seconds")
 
 
-async def test_batch_generation():
+async def test_batch_generation(service: GeminiService):
     """Test batch recipe generation"""
     print("\n🧪 Testing batch recipe generation...")
     
@@ -91,30 +94,28 @@ async def test_batch_generation():
         }
     ]
     
-    async with GeminiService() as service:
-        start_time = time.time()
-        
-        results = await service.generate_multiple_recipes(requests)
-        
-        end_time = time.time()
-        
-        total_recipes = sum(len(result) for result in results)
-        print(f"✅ Batch generated {total_recipes} recipes in {end_time - start_time:.2f} seconds")
+    start_time = time.perf_counter()
+    
+    results = await service.generate_multiple_recipes(requests)
+    
+    end_time = time.perf_counter()
+    
+    total_recipes = sum(len(result) for result in results)
+    print(f"✅ Batch generated {total_recipes} recipes in {end_time - start_time:.2f} seconds")
 
 
-async def test_timeout_handling():
+async def test_timeout_handling(service: GeminiService):
     """Test timeout handling"""
     print("\n🧪 Testing timeout handling...")
     
-    async with GeminiService() as service:
-        try:
-            recipes = await service.generate_recipes(
-                ingredients=["test"],
-                timeout=1  # Very short timeout to trigger fallback
-            )
-            print(f"✅ Handled timeout gracefully, got {len(recipes)} fallback recipes")
-        except Exception as e:
-            print(f"❌ Timeout handling failed: {e}")
+    try:
+        recipes = await service.generate_recipes(
+            ingredients=["test"],
+            timeout=1  # Very short timeout to trigger fallback
+        )
+        print(f"✅ Handled timeout gracefully, got {len(recipes)} fallback recipes")
+    except Exception as e:
+        print(f"❌ Timeout handling failed: {e}")
 
 
 async def main():
@@ -123,10 +124,14 @@ async def main():
     print("=" * 50)
     
     try:
-        await test_single_generation()
-        await test_concurrent_generation()
-        await test_batch_generation()
-        await test_timeout_handling()
+        # One service (and thread pool) for the whole run, with one connection
+        # pool so later calls reuse the keep-alive connection to Gemini
+        async with aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=60) as connector:
+            async with GeminiService(connector=connector) as service:
+                await test_single_generation(service)
+                await test_concurrent_generation(service)
+                await test_batch_generation(service)
+                await test_timeout_handling(service)
         
         print("\n" + "=" * 50)
         print("✅ All async tests completed successfully!")